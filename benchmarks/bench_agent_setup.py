@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of per-request CrewAI setup cost in the AI service.
+
+Compares building a fresh Agent, Task and Crew for every request (the
+previous behavior) with binding a per-request Task to an agent from the
+thread-local registry. No LLM call is made; only object construction is
+timed.
+
+Usage:
+    python benchmarks/bench_agent_setup.py [iterations]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crewai import Agent, Task, Crew, Process
+from travel_planner.config import initialize_llm
+from travel_planner.services.ai_service import AGENT_PROFILES, ANALYSIS_PROMPTS, get_agent
+
+SAMPLE_DATA = "\n".join(
+    f"Flight {i}:\n- Airline: Example Air\n- Price: ${400 + i}\n- Duration: 7h 5m\n- Stops: Direct"
+    for i in range(1, 21)
+)
+
+
+def setup_per_request():
+    """Build agent, task and crew from scratch, as each request used to."""
+    profile = AGENT_PROFILES["flights"]
+    agent = Agent(
+        role=profile["role"],
+        goal=profile["goal"],
+        backstory=profile["backstory"],
+        llm=initialize_llm(),
+        verbose=False
+    )
+    task = Task(
+        description=f"{ANALYSIS_PROMPTS['flights']}\n\nData to analyze:\n{SAMPLE_DATA}",
+        agent=agent,
+        expected_output=profile["expected_output"]
+    )
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=False)
+
+
+def setup_with_registry():
+    """Bind a per-request task to the registered agent."""
+    agent = get_agent("flights")
+    task = Task(
+        description=f"{ANALYSIS_PROMPTS['flights']}\n\nData to analyze:\n{SAMPLE_DATA}",
+        agent=agent,
+        expected_output=AGENT_PROFILES["flights"]["expected_output"]
+    )
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=False)
+
+
+def bench(label, fn, iterations):
+    fn()  # Warm up caches and lazy imports
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / iterations * 1e6
+    print(f"{label:<24} {per_call_us:10.1f} us/request")
+    return per_call_us
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    before = bench("per-request objects", setup_per_request, iterations)
+    after = bench("agent registry", setup_with_registry, iterations)
+    print(f"{'speedup':<24} {before / after:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Offline load benchmark of the API endpoints.
+
+Drives the FastAPI app in-process at a fixed concurrency, with SerpAPI
+replaced by the recorded fixtures and the LLM replaced by a deterministic
+fake (see ``harness.py``). No network access or API quota is used. For each
+endpoint it reports latency percentiles, throughput and the process's peak
+RSS after the run.
+
+Each request uses different dates, so by default no search is served from the
+cache or coalesced; pass ``--cache`` to replay one identical request and
+measure the cached path instead. The fixtures do not depend on the dates, so
+concurrent AI requests for identical search results can still share one
+fake LLM call; the ``fake LLM calls`` line reports how many were made.
+
+Usage:
+    python benchmarks/bench_api.py --requests 200 --concurrency 20 --llm-latency 0.5
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+import httpx
+
+from harness import install_fakes, peak_rss_mb, percentile
+
+BASE_DATE = date(2030, 1, 1)
+
+
+def _dates(index: int, nights: int = 5):
+    start = BASE_DATE + timedelta(days=index % 365)
+    return start.isoformat(), (start + timedelta(days=nights)).isoformat()
+
+
+def flight_payload(index: int) -> dict:
+    outbound, inbound = _dates(index)
+    return {"origin": "JFK", "destination": "LHR", "outbound_date": outbound, "return_date": inbound}
+
+
+def hotel_payload(index: int) -> dict:
+    check_in, check_out = _dates(index)
+    return {"location": "London", "check_in_date": check_in, "check_out_date": check_out}
+
+
+def itinerary_payload(index: int) -> dict:
+    check_in, check_out = _dates(index)
+    return {
+        "destination": "London",
+        "check_in_date": check_in,
+        "check_out_date": check_out,
+        "flights": "Flight 1:\n- Airline: British Airways\n- Price: $612",
+        "hotels": "Hotel 1:\n- Name: The Strand Hotel\n- Price: $245"
+    }
+
+
+def trip_payload(index: int) -> dict:
+    return flight_payload(index)
+
+
+ENDPOINTS = {
+    "search_flights": ("/search_flights/", flight_payload),
+    "search_hotels": ("/search_hotels/", hotel_payload),
+    "generate_itinerary": ("/generate_itinerary/", itinerary_payload),
+    "plan_trip": ("/plan_trip/", trip_payload),
+}
+
+
+async def run_endpoint(client: httpx.AsyncClient, path: str, build_payload, total: int,
+                       concurrency: int, same_payload: bool) -> dict:
+    """Send ``total`` requests with ``concurrency`` in flight and collect latencies."""
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            payload = build_payload(0 if same_payload else index)
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "rps": total / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def main_async(args) -> None:
+    fake_llm = install_fakes(args.llm_latency, args.search_latency, use_cache=args.cache)
+    from travel_planner.api import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"{'endpoint':<20} {'req':>6} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'p99 ms':>9} {'peak RSS MiB':>13}")
+        for name in args.endpoints:
+            path, build_payload = ENDPOINTS[name]
+            # Warm up imports, agent registry and connection pool
+            await client.post(path, json=build_payload(args.requests + 1))
+            stats = await run_endpoint(client, path, build_payload, args.requests, args.concurrency, args.cache)
+            print(f"{name:<20} {stats['requests']:>6} {stats['errors']:>5} {stats['rps']:>9.1f} "
+                  f"{stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} {stats['p99'] * 1000:>9.1f} "
+                  f"{stats['peak_rss_mb']:>13.1f}")
+    print(f"fake LLM calls: {fake_llm.calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at once")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="Seconds per fixture search")
+    parser.add_argument("--cache", action="store_true", help="Replay one identical request through the caches")
+    parser.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the direct JSON response path.
+
+Compares, for 10/100/1000 flights and hotels:
+
+- validated: the transformed items in an ``AIResponse`` handled like
+  FastAPI's ``response_model`` (dump to a dict, validate every item again,
+  encode with ``json.dumps``)
+- fast: the transformed items in an ``AIResponse`` serialized straight to
+  JSON bytes, as the endpoints now do
+
+Before timing, it checks that both paths produce the same decoded JSON body, and exits with status 1 if they differ.
+
+Usage:
+    python benchmarks/bench_fast_path.py [--sizes 10 100 1000] [--repeat 20]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from harness import load_fixture_items
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+from travel_planner.models import AIResponse
+from travel_planner.utils.transformers import transform_serpapi_flights, transform_serpapi_hotels
+
+
+def validated_response(flights, hotels) -> bytes:
+    response = AIResponse(flights=flights, hotels=hotels, ai_flight_recommendation="Option 1")
+    # What FastAPI does with a returned model when response_model is set
+    revalidated = AIResponse.model_validate(response.model_dump())
+    return JSONResponse(jsonable_encoder(revalidated)).body
+
+
+def fast_response(flights, hotels) -> bytes:
+    response = AIResponse.model_construct(flights=flights, hotels=hotels, ai_flight_recommendation="Option 1")
+    return to_json(response)
+
+
+def check_equivalence(raw_flights, raw_hotels) -> bool:
+    flights = transform_serpapi_flights(raw_flights)
+    hotels = transform_serpapi_hotels(raw_hotels)
+    return json.loads(fast_response(flights, hotels)) == json.loads(validated_response(flights, hotels))
+
+
+def bench(fn, repeat: int) -> float:
+    """Best-of-``repeat`` wall time of ``fn()`` in seconds."""
+    fn()  # Warm up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'items':>6} {'validated ms':>13} {'fast ms':>9} {'speedup':>8}  identical")
+    failed = False
+    for size in args.sizes:
+        raw_flights = load_fixture_items("google_flights", size)
+        raw_hotels = load_fixture_items("google_hotels", size)
+        identical = check_equivalence(raw_flights, raw_hotels)
+        failed = failed or not identical
+
+        def validated_path():
+            return validated_response(transform_serpapi_flights(raw_flights), transform_serpapi_hotels(raw_hotels))
+
+        def fast_path():
+            return fast_response(transform_serpapi_flights(raw_flights), transform_serpapi_hotels(raw_hotels))
+
+        before = bench(validated_path, args.repeat)
+        after = bench(fast_path, args.repeat)
+        print(f"{size:>6} {before * 1000:>13.3f} {after * 1000:>9.3f} {before / after:>7.2f}x  {identical}")
+
+    if failed:
+        print("Fast path output differs from the validated path", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks of the transform and formatting stages.
+
+Times ``transform_serpapi_flights``, ``transform_serpapi_hotels`` and
+``format_travel_data`` on 10, 100 and 1000 items built by cycling the
+recorded SerpAPI fixtures, plus the single-pass record pipeline the API uses
+(normalize once, then build both the models and the prompt text). Finally
+compares the prompt size of the verbose per-record listing the prompts used
+to be built from (kept here as the baseline) with the ranked, token-budgeted
+table.
+
+Usage:
+    python benchmarks/bench_transforms.py [--sizes 10 100 1000] [--repeat 20]
+"""
+
+import argparse
+import time
+from typing import List
+
+from harness import load_fixture_items
+
+from travel_planner.utils.formatters import format_travel_data
+from travel_planner.utils.records import (
+    FlightRecord, HotelRecord, normalize_flights, normalize_hotels, flight_records_to_models,
+    hotel_records_to_models
+)
+from travel_planner.utils.prompt_builder import build_flight_prompt, build_hotel_prompt, estimate_tokens
+from travel_planner.utils.transformers import transform_serpapi_flights, transform_serpapi_hotels
+
+
+TOKEN_BUDGET = 800
+MAX_CANDIDATES = 20
+
+
+def format_flight_records(records: List[FlightRecord]) -> str:
+    """Baseline: every flight as a verbose multi-line block, in SerpAPI order."""
+    if not records:
+        return "No flight data available."
+
+    lines = []
+    for i, record in enumerate(records, 1):
+        stops = record.stops_text
+        if record.layovers:
+            stops = f"{stops} via {', '.join(record.layovers)}"
+        departure = f"{record.departure} ({record.departure_airport})" if record.departure_airport else record.departure
+        arrival = f"{record.arrival} ({record.arrival_airport})" if record.arrival_airport else record.arrival
+        lines.extend((
+            "",
+            f"Flight {i}:",
+            f"- Airline: {record.airline}",
+            f"- Price: {record.price_text}",
+            f"- Duration: {record.duration_text}",
+            f"- Stops: {stops}",
+            f"- Departure: {departure}",
+            f"- Arrival: {arrival}",
+            f"- Travel Class: {record.travel_class}",
+        ))
+    return "\n".join(lines)
+
+
+def format_hotel_records(records: List[HotelRecord]) -> str:
+    """Baseline: every hotel as a verbose multi-line block, in SerpAPI order."""
+    if not records:
+        return "No hotel data available."
+
+    lines = []
+    for i, record in enumerate(records, 1):
+        rating = f"{record.rating} ({record.reviews} reviews)" if record.reviews else f"{record.rating}"
+        lines.extend((
+            "",
+            f"Hotel {i}:",
+            f"- Name: {record.name}",
+            f"- Price: {record.price_text} per night",
+            f"- Rating: {rating}",
+            f"- Location: {record.location}",
+            f"- Link: {record.link}",
+        ))
+    return "\n".join(lines)
+
+
+def flight_pipeline(raw_flights):
+    records = normalize_flights(raw_flights)
+    return flight_records_to_models(records), build_flight_prompt(records, TOKEN_BUDGET, MAX_CANDIDATES)
+
+
+def hotel_pipeline(raw_hotels):
+    records = normalize_hotels(raw_hotels)
+    return hotel_records_to_models(records), build_hotel_prompt(records, TOKEN_BUDGET, MAX_CANDIDATES)
+
+
+def bench(fn, arg, repeat: int) -> float:
+    """Best-of-``repeat`` wall time of ``fn(arg)`` in seconds."""
+    fn(arg)  # Warm up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'stage':<28} {'items':>6} {'total ms':>10} {'us/item':>9}")
+    for size in args.sizes:
+        raw_flights = load_fixture_items("google_flights", size)
+        raw_hotels = load_fixture_items("google_hotels", size)
+        flights = [flight.model_dump() for flight in transform_serpapi_flights(raw_flights)]
+        hotels = [hotel.model_dump() for hotel in transform_serpapi_hotels(raw_hotels)]
+
+        cases = [
+            ("transform_serpapi_flights", transform_serpapi_flights, raw_flights),
+            ("transform_serpapi_hotels", transform_serpapi_hotels, raw_hotels),
+            ("format_travel_data flights", lambda data: format_travel_data("flights", data), flights),
+            ("format_travel_data hotels", lambda data: format_travel_data("hotels", data), hotels),
+            ("record pipeline flights", flight_pipeline, raw_flights),
+            ("record pipeline hotels", hotel_pipeline, raw_hotels),
+        ]
+        for label, fn, arg in cases:
+            seconds = bench(fn, arg, args.repeat)
+            print(f"{label:<28} {size:>6} {seconds * 1000:>10.3f} {seconds / size * 1e6:>9.2f}")
+
+    print()
+    print(f"{'prompt tokens':<28} {'items':>6} {'verbose':>10} {'budgeted':>9}")
+    for size in args.sizes:
+        flight_records = normalize_flights(load_fixture_items("google_flights", size))
+        hotel_records = normalize_hotels(load_fixture_items("google_hotels", size))
+        for label, verbose, budgeted in (
+            ("flights", format_flight_records(flight_records),
+             build_flight_prompt(flight_records, TOKEN_BUDGET, MAX_CANDIDATES)),
+            ("hotels", format_hotel_records(hotel_records),
+             build_hotel_prompt(hotel_records, TOKEN_BUDGET, MAX_CANDIDATES)),
+        ):
+            print(f"{label:<28} {size:>6} {estimate_tokens(verbose):>10} {estimate_tokens(budgeted):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Shared helpers for the offline benchmarks.
+
+Installs in-process replacements for the two paid upstreams so the API can be
+driven without network access or quota:
+
+- SerpAPI: the shared SerpAPI client is swapped for one whose transport
+  replays ``fixtures/<engine>.json``, so searches still go through
+  ``run_search`` (cache, coalescing, concurrency limits, transforms).
+- LLM: ``initialize_llm`` returns a deterministic ``FakeLLM`` and the
+  blocking agent call is routed to it, so AI requests still go through the
+  AI cache, coalescing and the LLM thread pool.
+"""
+
+import asyncio
+import json
+import resource
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from serpapi_stub import load_fixtures
+
+FAKE_ITINERARY = """# Trip Itinerary
+
+## Day 1
+- Morning: Arrive and check in
+- Afternoon: Walk through the city centre
+- Evening: Dinner near the hotel
+
+## Day 2
+- Morning: Museum visit
+- Afternoon: Local market
+- Evening: River cruise
+"""
+
+FAKE_RECOMMENDATION = """## Recommendation
+Option 1 offers the best balance of price, duration and convenience.
+"""
+
+
+class FakeLLM:
+    """Deterministic stand-in for the Gemini LLM with a fixed latency."""
+
+    def __init__(self, latency: float = 0.0, model: str = "fake/benchmark-llm"):
+        self.latency = latency
+        self.model = model
+        self.calls = 0
+
+    def call(self, prompt: str) -> str:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)  # Blocks a worker thread, like the real LLM call
+        return FAKE_ITINERARY if "itinerary" in prompt.lower() else FAKE_RECOMMENDATION
+
+
+def fixture_transport(latency: float = 0.0, fixtures: dict = None) -> httpx.MockTransport:
+    """In-process SerpAPI transport answering from the recorded fixtures."""
+    fixtures = fixtures if fixtures is not None else load_fixtures()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if latency:
+            await asyncio.sleep(latency)
+        engine = request.url.params.get("engine", "")
+        if engine not in fixtures:
+            return httpx.Response(400, json={"error": f"No fixture for engine '{engine}'"})
+        return httpx.Response(200, content=fixtures[engine], headers={"Content-Type": "application/json"})
+
+    return httpx.MockTransport(handler)
+
+
+def install_fakes(llm_latency: float = 0.0, search_latency: float = 0.0, use_cache: bool = False) -> FakeLLM:
+    """
+    Point the app at the fixture transport and the fake LLM.
+
+    Args:
+        llm_latency: Seconds each fake LLM call blocks its worker thread
+        search_latency: Seconds each fixture search waits before answering
+        use_cache: Keep the search, parsed-records, AI and result-store
+            caches; by default they are all replaced with no-op caches so
+            every request does the full work (stored results and
+            itineraries then cannot be read back)
+
+    Returns:
+        The installed FakeLLM (its ``calls`` counter shows LLM usage)
+    """
+    from travel_planner import config
+    from travel_planner.services import ai_service, result_store, search_service, serpapi_client
+    from travel_planner.utils.cache import NullCache
+
+    fake_llm = FakeLLM(llm_latency)
+    config.initialize_llm = ai_service.initialize_llm = lambda: fake_llm
+    ai_service.run_agent_task = lambda agent_type, prompt: fake_llm.call(prompt)
+
+    serpapi_client.set_serpapi_client(
+        serpapi_client.SerpAPIClient(transport=fixture_transport(search_latency))
+    )
+
+    if not use_cache:
+        search_service.search_cache = NullCache()
+        search_service.records_cache = NullCache()
+        ai_service.ai_cache = NullCache()
+        result_store.result_store = NullCache()
+        result_store.itinerary_store = NullCache()
+    return fake_llm
+
+
+def load_fixture_items(engine: str, count: int) -> list:
+    """
+    Return ``count`` raw SerpAPI result items for ``engine``, cycling the fixture.
+
+    Flights come from ``best_flights`` + ``other_flights``; hotels from ``properties``.
+    """
+    data = json.loads(load_fixtures()[engine])
+    if engine == "google_flights":
+        items = data.get("best_flights", []) + data.get("other_flights", [])
+    else:
+        items = data.get("properties", [])
+    return [items[i % len(items)] for i in range(count)]
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
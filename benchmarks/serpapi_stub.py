@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Local SerpAPI stub server that replays recorded JSON fixtures.
+
+Serves ``GET /search.json`` and answers with ``fixtures/<engine>.json`` for the
+requested ``engine`` parameter, optionally after an artificial delay. Point the
+API at it with ``SERPAPI_BASE_URL``:
+
+    python benchmarks/serpapi_stub.py --port 8001 --latency 0.5
+    SERPAPI_BASE_URL=http://127.0.0.1:8001 python main.py
+"""
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_fixtures(fixtures_dir: Path = FIXTURES_DIR) -> dict:
+    """Load every ``<engine>.json`` fixture, keyed by engine name."""
+    return {path.stem: path.read_bytes() for path in fixtures_dir.glob("*.json")}
+
+
+def make_handler(fixtures: dict, latency: float):
+    class SerpAPIStubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            engine = parse_qs(url.query).get("engine", [""])[0]
+            if url.path != "/search.json" or engine not in fixtures:
+                status, body = 400, json.dumps({"error": f"No fixture for engine '{engine}'"}).encode()
+            else:
+                status, body = 200, fixtures[engine]
+
+            if latency:
+                time.sleep(latency)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SerpAPIStubHandler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8001, latency: float = 0.0) -> ThreadingHTTPServer:
+    """Create a stub server; call ``serve_forever()`` on the result to run it."""
+    return ThreadingHTTPServer((host, port), make_handler(load_fixtures(), latency))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.latency)
+    print(f"SerpAPI stub listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+The record pipeline must build exactly the models the original dict-based
+transforms built, on the recorded SerpAPI fixtures and on sparse items.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from travel_planner.models import FlightInfo, HotelInfo
+from travel_planner.utils.records import (
+    normalize_flights, normalize_hotels, flight_records_to_models, hotel_records_to_models
+)
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+
+def legacy_transform_flights(raw_flights):
+    """The original transform, walking each raw SerpAPI dict directly."""
+    flights = []
+    for flight_data in raw_flights or []:
+        flights_list = flight_data.get("flights", [])
+        total_duration = flight_data.get("total_duration", 0)
+        price = flight_data.get("price", 0)
+        stops_count = len(flight_data.get("layovers", []))
+        primary_flight = flights_list[0] if flights_list else {}
+        departure_info = primary_flight.get("departure_airport", {})
+        arrival_info = flights_list[-1].get("arrival_airport", {}) if flights_list else {}
+        hours, minutes = total_duration // 60, total_duration % 60
+        flights.append(FlightInfo(
+            airline=primary_flight.get("airline", "Multiple Airlines"),
+            price=f"${price}" if price else "N/A",
+            duration=f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m",
+            stops=f"{stops_count} stop{'s' if stops_count != 1 else ''}" if stops_count > 0 else "Direct",
+            departure=departure_info.get("time", "N/A"),
+            arrival=arrival_info.get("time", "N/A"),
+            travel_class=primary_flight.get("travel_class", "Economy"),
+            return_date=flight_data.get("return_date", "N/A"),
+            airline_logo=flight_data.get("airline_logo", primary_flight.get("airline_logo", ""))
+        ))
+    return flights
+
+
+def legacy_transform_hotels(raw_hotels):
+    """The original transform, walking each raw SerpAPI dict directly."""
+    hotels = []
+    for hotel_data in raw_hotels or []:
+        location = "Location not specified"
+        nearby_places = hotel_data.get("nearby_places", [])
+        if nearby_places and nearby_places[0].get("name", ""):
+            location = f"Near {nearby_places[0]['name']}"
+        if location == "Location not specified":
+            gps = hotel_data.get("gps_coordinates", {})
+            if gps.get("latitude") and gps.get("longitude"):
+                location = f"Coordinates: {round(gps['latitude'], 2)}, {round(gps['longitude'], 2)}"
+
+        price_info = hotel_data.get("rate_per_night", {})
+        if isinstance(price_info, dict):
+            price_str = price_info.get("lowest") or price_info.get("rate") or price_info.get("price")
+        else:
+            price_str = hotel_data.get("price") or hotel_data.get("rate")
+
+        hotels.append(HotelInfo(
+            name=hotel_data.get("name", "Unknown Hotel"),
+            price=str(price_str) if price_str else "Price not available",
+            rating=float(hotel_data.get("overall_rating", 0.0) or hotel_data.get("rating", 0.0) or 0.0),
+            location=location,
+            link=hotel_data.get("link", "")
+        ))
+    return hotels
+
+
+def load_fixture(engine):
+    data = json.loads((FIXTURES / f"{engine}.json").read_text())
+    if engine == "google_flights":
+        return data.get("best_flights", []) + data.get("other_flights", [])
+    return data.get("properties", [])
+
+
+SPARSE_FLIGHTS = [
+    {},
+    {"price": 0, "total_duration": 45, "flights": []},
+    {"price": 812.5, "total_duration": 600, "layovers": [{"id": "DXB"}],
+     "flights": [{"airline": "Emirates", "departure_airport": {"time": "2024-12-01 02:00"}},
+                 {"arrival_airport": {"time": "2024-12-01 12:00"}}]},
+    {"price": 430, "total_duration": 125, "layovers": [{"name": "Doha"}, {"id": "SIN"}],
+     "airline_logo": "logo.png", "return_date": "2024-12-10",
+     "flights": [{"airline": "Qatar Airways", "travel_class": "Business", "airline_logo": "segment.png"}]},
+]
+
+SPARSE_HOTELS = [
+    {},
+    {"name": "GPS Inn", "gps_coordinates": {"latitude": -33.86785, "longitude": 151.20732}, "rating": 4.2},
+    {"name": "Nameless Landmark", "nearby_places": [{"name": ""}], "rate_per_night": {"rate": "$99"}},
+    {"name": "Flat Rate", "rate_per_night": "n/a", "price": "$120", "overall_rating": None, "link": "https://x"},
+    {"name": "Rate Only", "rate_per_night": None, "rate": "$75", "overall_rating": 3.9},
+]
+
+
+@pytest.mark.parametrize("raw_flights", [
+    pytest.param(load_fixture("google_flights"), id="fixture"),
+    pytest.param(SPARSE_FLIGHTS, id="sparse"),
+    pytest.param([], id="empty"),
+])
+def test_flight_records_match_legacy_transform(raw_flights):
+    assert flight_records_to_models(normalize_flights(raw_flights)) == legacy_transform_flights(raw_flights)
+
+
+@pytest.mark.parametrize("raw_hotels", [
+    pytest.param(load_fixture("google_hotels"), id="fixture"),
+    pytest.param(SPARSE_HOTELS, id="sparse"),
+    pytest.param([], id="empty"),
+])
+def test_hotel_records_match_legacy_transform(raw_hotels):
+    assert hotel_records_to_models(normalize_hotels(raw_hotels)) == legacy_transform_hotels(raw_hotels)
@@ -0,0 +1,94 @@
+"""
+The pooled SerpAPI client and the search cache, against an in-process stub.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from travel_planner.services import search_service
+from travel_planner.services.serpapi_client import SerpAPIClient, SerpAPIError, set_serpapi_client
+from travel_planner.utils.cache import MemoryCache
+from travel_planner.utils.metrics import UPSTREAM_ERRORS
+
+PARAMS = {"engine": "google_flights", "departure_id": "JFK", "arrival_id": "LHR",
+          "outbound_date": "2024-12-01", "api_key": "test-key"}
+
+RESULTS = {"best_flights": [{"price": 640, "flights": [{"airline": "British Airways"}]}]}
+
+
+class StubSerpAPI:
+    """Answers every search with a fixed status and JSON body, recording the requests."""
+
+    def __init__(self, status_code: int = 200, body: dict = None):
+        self.status_code = status_code
+        self.body = RESULTS if body is None else body
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(self.status_code, json=self.body)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = StubSerpAPI()
+    set_serpapi_client(SerpAPIClient(base_url="https://serpapi.test", transport=httpx.MockTransport(stub)))
+    monkeypatch.setattr(search_service, "search_cache", MemoryCache())
+    yield stub
+    set_serpapi_client(None)
+
+
+def test_client_sends_params_and_decodes_json():
+    stub = StubSerpAPI()
+    client = SerpAPIClient(base_url="https://serpapi.test", transport=httpx.MockTransport(stub))
+
+    assert asyncio.run(client.search(PARAMS)) == RESULTS
+    request, = stub.requests
+    assert request.url.path == "/search.json"
+    assert dict(request.url.params) == PARAMS
+
+
+def test_client_raises_on_error_status():
+    stub = StubSerpAPI(401, {"error": "Invalid API key."})
+    client = SerpAPIClient(base_url="https://serpapi.test", transport=httpx.MockTransport(stub))
+
+    with pytest.raises(SerpAPIError, match="Invalid API key"):
+        asyncio.run(client.search(PARAMS))
+
+
+def test_successful_search_is_cached(stub):
+    assert asyncio.run(search_service.run_search(PARAMS)) == RESULTS
+    assert asyncio.run(search_service.run_search({**PARAMS, "api_key": "other-key"})) == RESULTS
+
+    # The API key does not affect the cache key, so the second search is a hit
+    assert len(stub.requests) == 1
+    assert len(search_service.search_cache) == 1
+
+
+def test_upstream_error_becomes_500_and_is_not_cached(stub):
+    stub.status_code, stub.body = 500, {"error": "Upstream unavailable"}
+    errors_before = UPSTREAM_ERRORS.value(service="serpapi")
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(search_service.run_search(PARAMS))
+
+    assert excinfo.value.status_code == 500
+    assert "Upstream unavailable" in excinfo.value.detail
+    assert UPSTREAM_ERRORS.value(service="serpapi") == errors_before + 1
+    assert len(search_service.search_cache) == 0
+
+    # The next identical search goes upstream again and, once it succeeds, is cached
+    stub.status_code, stub.body = 200, RESULTS
+    assert asyncio.run(search_service.run_search(PARAMS)) == RESULTS
+    assert len(stub.requests) == 2
+    assert len(search_service.search_cache) == 1
+
+
+def test_error_body_with_ok_status_is_not_cached(stub):
+    stub.body = {"error": "Google hasn't returned any results for this query."}
+
+    assert asyncio.run(search_service.run_search(PARAMS)) == stub.body
+    assert len(search_service.search_cache) == 0
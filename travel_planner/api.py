@@ -1,45 +1,733 @@
+import asyncio
+import json
+import time
+import uuid
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from .models import FlightRequest, HotelRequest, ItineraryRequest, AIResponse
-from .services.search_service import search_flights, search_hotels
-from .services.ai_service import get_ai_recommendation, generate_itinerary
-from .utils.formatters import format_travel_data
-from .utils.transformers import transform_serpapi_flights, transform_serpapi_hotels
-from .config import logger
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.routing import Match
+from .models import (
+    FlightRequest, HotelRequest, ItineraryRequest, TripRequest, AIResponse, RecommendationStatus,
+    ItineraryJobStatus, RecommendationMode, FlexibleFlightRequest, PriceCalendar, FlightFilters, HotelFilters,
+    FlightSortKey, HotelSortKey, Pagination, BatchFlightRequest, BatchHotelRequest, BatchResponse,
+    MultiCityTripRequest, MultiCityTripResponse, StructuredItinerary, SectionRegenerationRequest
+)
+from .constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_SELECTED_OPTIONS
+from .services.search_service import (
+    search_flight_records, search_hotel_records, search_cache, records_cache, search_singleflight
+)
+from .services.flexible_search_service import search_flexible_dates
+from .services.batch_service import batch_search_flights, batch_search_hotels
+from .services.multi_city_service import plan_multi_city_trip
+from .services.result_store import (
+    result_store, itinerary_store, save_flight_results, save_hotel_results, load_flight_results, load_hotel_results
+)
+from .services.itinerary_service import (
+    store_itinerary, get_itinerary_sections, find_day_section, regenerate_section
+)
+from .services.ai_service import get_ai_recommendation, generate_itinerary, ai_cache, ai_singleflight
+from .services.executors import search_executor, llm_executor
+from .services.recommendation_jobs import recommendation_jobs
+from .services.itinerary_queue import ItineraryQueue, ItineraryWorkerPool
+from .services.serpapi_client import get_serpapi_client, close_serpapi_client
+from .utils.records import flight_records_to_models, hotel_records_to_models
+from .utils.filtering import filter_flights, filter_hotels, sort_flights, sort_hotels, paginate
+from .utils.prompt_builder import (
+    build_flight_prompt, build_hotel_prompt, format_selected_flights, format_selected_hotels
+)
+from .utils.ranking import rank_flights, rank_hotels, explain_flight_ranking, explain_hotel_ranking
+from .utils.location_utils import convert_airport_code_to_city
+from .utils.sse import sse_event, stream_markdown_result
+from .utils.tracing import begin_request
+from .utils.metrics import (
+    registry, REQUEST_LATENCY, REQUESTS_IN_FLIGHT, CACHE_REQUESTS, CACHE_HIT_RATIO, CACHE_ENTRIES,
+    EXECUTOR_QUEUE_DEPTH, EXECUTOR_ACTIVE, EXECUTOR_REJECTED, COALESCED_REQUESTS
+)
+from .config import (
+    logger, payload_sampler, ITINERARY_WORKERS, AI_PROMPT_TOKEN_BUDGET, AI_PROMPT_MAX_CANDIDATES,
+    FLIGHT_RANKING_WEIGHTS, HOTEL_RANKING_WEIGHTS
+)
+from .logging_setup import begin_request_sampling
 
-app = FastAPI(title="Travel Planning API", version="1.0.1")
+# Upper bound for long-polling a background recommendation
+MAX_RECOMMENDATION_WAIT = 30
 
 
-@app.post("/search_flights/", response_model=AIResponse)
-async def get_flight_recommendations(flight_request: FlightRequest):
-    raw_flights = await search_flights(flight_request)
-    # Transform raw SerpAPI data to FlightInfo models
-    flights = transform_serpapi_flights(raw_flights if raw_flights else [])
-    flights_text = format_travel_data("flights", raw_flights if raw_flights else [])
+# Created on startup, so importing the app does not create the queue database
+itinerary_queue: Optional[ItineraryQueue] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global itinerary_queue
+    # Share one pooled SerpAPI connection for the lifetime of the app
+    get_serpapi_client()
+    itinerary_queue = ItineraryQueue()
+    # Itinerary workers run in separate processes; with ITINERARY_WORKERS=0
+    # they are expected to be started standalone against the same queue
+    worker_pool = ItineraryWorkerPool(itinerary_queue.path, ITINERARY_WORKERS)
+    worker_pool.start()
+    yield
+    worker_pool.stop()
+    await close_serpapi_client()
+
+
+app = FastAPI(title="Travel Planning API", version="1.0.1", lifespan=lifespan)
+
+
+def _endpoint_name(scope) -> str:
+    """Route template of the request (e.g. '/itinerary_jobs/{job_id}') to keep label cardinality low."""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+@app.middleware("http")
+async def observe_requests(request, call_next):
+    # Decide once per request whether raw payloads get logged
+    begin_request_sampling(payload_sampler)
+    # Tag trace spans with the caller's request id, or a fresh one
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    begin_request(request_id)
+
+    endpoint = _endpoint_name(request.scope)
+    REQUESTS_IN_FLIGHT.inc(endpoint=endpoint)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec(endpoint=endpoint)
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - start, method=request.method, endpoint=endpoint, status=status
+        )
+
+
+def _collect_component_metrics() -> None:
+    """Copy cache, executor and coalescing statistics into the metrics registry."""
+    for name, cache in (("search", search_cache), ("records", records_cache), ("ai", ai_cache),
+                        ("results", result_store), ("itineraries", itinerary_store)):
+        CACHE_REQUESTS.set(cache.stats.hits, cache=name, result="hit")
+        CACHE_REQUESTS.set(cache.stats.misses, cache=name, result="miss")
+        CACHE_HIT_RATIO.set(cache.stats.hit_ratio, cache=name)
+        CACHE_ENTRIES.set(len(cache), cache=name)
+
+    for executor in (search_executor, llm_executor):
+        EXECUTOR_QUEUE_DEPTH.set(executor.queue_depth, executor=executor.name)
+        EXECUTOR_ACTIVE.set(executor.active, executor=executor.name)
+        EXECUTOR_REJECTED.set(executor.rejected, executor=executor.name)
+
+    COALESCED_REQUESTS.set(search_singleflight.coalesced, kind="search")
+    COALESCED_REQUESTS.set(ai_singleflight.coalesced, kind="ai")
+
+
+registry.add_collector(_collect_component_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of latency histograms, counters and gauges."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+def flight_filters(
+    max_price: Optional[float] = Query(None, gt=0, description="Highest flight price"),
+    max_stops: Optional[int] = Query(None, ge=0, description="Most stops allowed"),
+    airline: Optional[str] = Query(None, description="Airline name, matched case-insensitively"),
+    sort: Optional[FlightSortKey] = Query(None, description="Order of the flights; SerpAPI's order if omitted")
+) -> FlightFilters:
+    """Flight filter and sort query parameters."""
+    return FlightFilters(max_price=max_price, max_stops=max_stops, airline=airline, sort=sort)
+
+
+def hotel_filters(
+    max_price: Optional[float] = Query(None, gt=0, description="Highest price per night"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5, description="Lowest overall rating"),
+    sort: Optional[HotelSortKey] = Query(None, description="Order of the hotels; SerpAPI's order if omitted")
+) -> HotelFilters:
+    """Hotel filter and sort query parameters."""
+    return HotelFilters(max_price=max_price, min_rating=min_rating, sort=sort)
+
+
+def pagination_params(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+) -> Pagination:
+    """Page query parameters."""
+    return Pagination(page=page, page_size=page_size)
+
+
+def _flight_prompt(records) -> str:
+    return build_flight_prompt(records, AI_PROMPT_TOKEN_BUDGET, AI_PROMPT_MAX_CANDIDATES, FLIGHT_RANKING_WEIGHTS)
+
+
+def _hotel_prompt(records) -> str:
+    return build_hotel_prompt(records, AI_PROMPT_TOKEN_BUDGET, AI_PROMPT_MAX_CANDIDATES, HOTEL_RANKING_WEIGHTS)
+
+
+async def _search_flight_data(flight_request: FlightRequest):
+    """Search flights and prepare both the FlightInfo list and the AI prompt text."""
+    # Parse each raw SerpAPI result once; models and prompt text share the records
+    records = await search_flight_records(flight_request)
+    return flight_records_to_models(records), _flight_prompt(records)
+
+
+async def _search_hotel_data(hotel_request: HotelRequest):
+    """Search hotels and prepare both the HotelInfo list and the AI prompt text."""
+    # Parse each raw SerpAPI result once; models and prompt text share the records
+    records = await search_hotel_records(hotel_request)
+    return hotel_records_to_models(records), _hotel_prompt(records)
+
+
+def _stored_positions(records) -> dict:
+    """Position of each record in stored results, by identity since filtering, sorting and paging keep the objects."""
+    return {id(record): position for position, record in enumerate(records)}
+
+
+def _with_stored_index(models, records, positions: dict):
+    """Set each model's ``index`` to the stored position of its record, for ``*_indices`` of an itinerary."""
+    for model, record in zip(models, records):
+        model.index = positions[id(record)]
+    return models
+
+
+def _flight_page(records, positions: dict, pagination: Pagination, **fields) -> AIResponse:
+    """Response with one page of ``records`` as flights, each with its stored index."""
+    page = paginate(records, pagination)
+    return AIResponse.model_construct(
+        flights=_with_stored_index(flight_records_to_models(page), page, positions),
+        total_results=len(records),
+        page=pagination.page,
+        page_size=pagination.page_size,
+        **fields
+    )
+
+
+def _hotel_page(records, positions: dict, pagination: Pagination, **fields) -> AIResponse:
+    """Response with one page of ``records`` as hotels, each with its stored index."""
+    page = paginate(records, pagination)
+    return AIResponse.model_construct(
+        hotels=_with_stored_index(hotel_records_to_models(page), page, positions),
+        total_results=len(records),
+        page=pagination.page,
+        page_size=pagination.page_size,
+        **fields
+    )
+
+
+async def _flight_results(flight_request: FlightRequest):
+    """Search flights, transform them and get the AI recommendation."""
+    flights, flights_text = await _search_flight_data(flight_request)
     ai_recommendation = await get_ai_recommendation("flights", flights_text)
-    return AIResponse(flights=flights, ai_flight_recommendation=ai_recommendation)
+    return flights, flights_text, ai_recommendation
 
 
-@app.post("/search_hotels/", response_model=AIResponse)
-async def get_hotel_recommendations(hotel_request: HotelRequest):
-    raw_hotels = await search_hotels(hotel_request)
-    # Transform raw SerpAPI data to HotelInfo models
-    hotels = transform_serpapi_hotels(raw_hotels if raw_hotels else [])
-    hotels_text = format_travel_data("hotels", raw_hotels if raw_hotels else [])
+async def _hotel_results(hotel_request: HotelRequest):
+    """Search hotels, transform them and get the AI recommendation."""
+    hotels, hotels_text = await _search_hotel_data(hotel_request)
     ai_recommendation = await get_ai_recommendation("hotels", hotels_text)
-    return AIResponse(hotels=hotels, ai_hotel_recommendation=ai_recommendation)
+    return hotels, hotels_text, ai_recommendation
+
+
+def _json_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Serialize a response model straight to JSON bytes.
+
+    Returning a Response skips FastAPI's response_model handling, which would
+    dump the model to a dict and validate every item again before encoding.
+    """
+    return Response(content=to_json(model), status_code=status_code, media_type="application/json")
+
+
+async def _event_stream(events):
+    """Wrap an SSE generator so failures are reported as an ``error`` event."""
+    try:
+        async for frame in events:
+            yield frame
+        yield sse_event("done", {})
+    except HTTPException as e:
+        yield sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+    except Exception as e:
+        logger.exception(f"Streaming response failed: {str(e)}")
+        yield sse_event("error", {"status_code": 500, "detail": str(e)})
+
+
+def _sse_response(events):
+    return StreamingResponse(
+        _event_stream(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _flight_response(records, result_id: str, filters: FlightFilters, pagination: Pagination,
+                           mode: RecommendationMode, async_ai: bool) -> Response:
+    """Filter, order and page stored flight records and add the recommendation for ``mode``."""
+    positions = _stored_positions(records)
+    records = filter_flights(records, filters)
+
+    if mode == "fast":
+        ranked = rank_flights(records, FLIGHT_RANKING_WEIGHTS)
+        recommendation = explain_flight_ranking(ranked, FLIGHT_RANKING_WEIGHTS)
+        ordered = ranked if filters.sort is None else sort_flights(records, filters.sort, FLIGHT_RANKING_WEIGHTS)
+        return _json_response(_flight_page(ordered, positions, pagination, result_id=result_id,
+                                           ai_flight_recommendation=recommendation))
+
+    ordered = sort_flights(records, filters.sort, FLIGHT_RANKING_WEIGHTS)
+    if mode == "none":
+        return _json_response(_flight_page(ordered, positions, pagination, result_id=result_id))
+
+    flights_text = _flight_prompt(records)
+    if async_ai:
+        job_id = recommendation_jobs.submit("flights", get_ai_recommendation("flights", flights_text))
+        return _json_response(_flight_page(ordered, positions, pagination, result_id=result_id, recommendation_id=job_id))
+
+    ai_recommendation = await get_ai_recommendation("flights", flights_text)
+    return _json_response(_flight_page(ordered, positions, pagination, result_id=result_id,
+                                       ai_flight_recommendation=ai_recommendation))
+
+
+async def _hotel_response(records, result_id: str, filters: HotelFilters, pagination: Pagination,
+                          mode: RecommendationMode, async_ai: bool) -> Response:
+    """Filter, order and page stored hotel records and add the recommendation for ``mode``."""
+    positions = _stored_positions(records)
+    records = filter_hotels(records, filters)
+
+    if mode == "fast":
+        ranked = rank_hotels(records, HOTEL_RANKING_WEIGHTS)
+        recommendation = explain_hotel_ranking(ranked, HOTEL_RANKING_WEIGHTS)
+        ordered = ranked if filters.sort is None else sort_hotels(records, filters.sort, HOTEL_RANKING_WEIGHTS)
+        return _json_response(_hotel_page(ordered, positions, pagination, result_id=result_id,
+                                          ai_hotel_recommendation=recommendation))
+
+    ordered = sort_hotels(records, filters.sort, HOTEL_RANKING_WEIGHTS)
+    if mode == "none":
+        return _json_response(_hotel_page(ordered, positions, pagination, result_id=result_id))
+
+    hotels_text = _hotel_prompt(records)
+    if async_ai:
+        job_id = recommendation_jobs.submit("hotels", get_ai_recommendation("hotels", hotels_text))
+        return _json_response(_hotel_page(ordered, positions, pagination, result_id=result_id, recommendation_id=job_id))
+
+    ai_recommendation = await get_ai_recommendation("hotels", hotels_text)
+    return _json_response(_hotel_page(ordered, positions, pagination, result_id=result_id,
+                                      ai_hotel_recommendation=ai_recommendation))
+
+
+@app.post("/search_flights/", response_model=AIResponse)
+async def get_flight_recommendations(flight_request: FlightRequest, async_ai: bool = False,
+                                     mode: RecommendationMode = "ai",
+                                     filters: FlightFilters = Depends(flight_filters),
+                                     pagination: Pagination = Depends(pagination_params)):
+    """
+    Search flights with an AI recommendation.
+
+    With ``async_ai=true`` the flights are returned immediately together with a
+    ``recommendation_id`` to fetch from ``/recommendations/{id}``. With
+    ``mode=fast`` the flights are ranked locally and the recommendation is a
+    templated explanation, with no LLM call; ``mode=none`` skips it.
+
+    Filters, sorting and paging apply to the cached results of the search, so
+    requesting another page makes no new SerpAPI call, and the recommendation
+    (which covers every matching flight) is served from the AI cache. The
+    results are stored under the returned ``result_id`` for ``/results/flights/``.
+    """
+    records = await search_flight_records(flight_request)
+    result_id = save_flight_results(flight_request, records)
+    return await _flight_response(records, result_id, filters, pagination, mode, async_ai)
+
+
+@app.post("/search_flights/flexible/", response_model=PriceCalendar)
+async def get_flexible_flights(flex_request: FlexibleFlightRequest):
+    """
+    Price calendar for flights within +/- ``flex_days`` of the requested dates.
+
+    Returns the cheapest fare for every outbound/return date pair and the
+    cheapest flights overall. No AI recommendation is made.
+    """
+    return _json_response(await search_flexible_dates(flex_request))
+
+
+@app.post("/search_hotels/", response_model=AIResponse)
+async def get_hotel_recommendations(hotel_request: HotelRequest, async_ai: bool = False,
+                                    mode: RecommendationMode = "ai",
+                                    filters: HotelFilters = Depends(hotel_filters),
+                                    pagination: Pagination = Depends(pagination_params)):
+    """
+    Search hotels with an AI recommendation.
+
+    With ``async_ai=true`` the hotels are returned immediately together with a
+    ``recommendation_id`` to fetch from ``/recommendations/{id}``. With
+    ``mode=fast`` the hotels are ranked locally and the recommendation is a
+    templated explanation, with no LLM call; ``mode=none`` skips it.
+
+    Filters, sorting and paging apply to the cached results of the search, so
+    requesting another page makes no new SerpAPI call, and the recommendation
+    (which covers every matching hotel) is served from the AI cache. The
+    results are stored under the returned ``result_id`` for ``/results/hotels/``.
+    """
+    records = await search_hotel_records(hotel_request)
+    result_id = save_hotel_results(hotel_request, records)
+    return await _hotel_response(records, result_id, filters, pagination, mode, async_ai)
+
+
+@app.get("/results/flights/{result_id}", response_model=AIResponse)
+async def get_stored_flights(result_id: str, async_ai: bool = False, mode: RecommendationMode = "none",
+                             filters: FlightFilters = Depends(flight_filters),
+                             pagination: Pagination = Depends(pagination_params)):
+    """
+    Page, filter, re-rank or re-analyze stored flight results without searching again.
+
+    Takes the same query parameters as ``/search_flights/``; by default no
+    recommendation is made.
+    """
+    return await _flight_response(load_flight_results(result_id), result_id, filters, pagination, mode, async_ai)
+
+
+@app.get("/results/hotels/{result_id}", response_model=AIResponse)
+async def get_stored_hotels(result_id: str, async_ai: bool = False, mode: RecommendationMode = "none",
+                            filters: HotelFilters = Depends(hotel_filters),
+                            pagination: Pagination = Depends(pagination_params)):
+    """
+    Page, filter, re-rank or re-analyze stored hotel results without searching again.
+
+    Takes the same query parameters as ``/search_hotels/``; by default no
+    recommendation is made.
+    """
+    return await _hotel_response(load_hotel_results(result_id), result_id, filters, pagination, mode, async_ai)
+
+
+@app.post("/batch/search_flights/", response_model=BatchResponse)
+async def batch_flight_search(batch: BatchFlightRequest):
+    """
+    Search up to 50 routes in one request.
+
+    Identical requests are searched once. Every request gets its own result
+    or error; with ``ai=true`` the result sets are analyzed several per LLM call.
+    """
+    return _json_response(await batch_search_flights(batch))
+
+
+@app.post("/batch/search_hotels/", response_model=BatchResponse)
+async def batch_hotel_search(batch: BatchHotelRequest):
+    """
+    Search hotels in up to 50 locations in one request.
+
+    Identical requests are searched once. Every request gets its own result
+    or error; with ``ai=true`` the result sets are analyzed several per LLM call.
+    """
+    return _json_response(await batch_search_hotels(batch))
+
+
+@app.get("/recommendations/{recommendation_id}", response_model=RecommendationStatus)
+async def get_recommendation(recommendation_id: str, wait: float = 0):
+    """Fetch a background AI recommendation, optionally long-polling up to ``wait`` seconds."""
+    job = await recommendation_jobs.wait(recommendation_id, min(max(wait, 0), MAX_RECOMMENDATION_WAIT))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Recommendation not found or expired")
+
+    return RecommendationStatus(
+        recommendation_id=job.job_id,
+        data_type=job.data_type,
+        status=job.status,
+        recommendation=job.recommendation,
+        error=job.error
+    )
+
+
+def _pick(records, indices, data_type: str):
+    """Records at ``indices`` of stored results."""
+    if any(not 0 <= i < len(records) for i in indices):
+        raise HTTPException(status_code=400, detail=f"{data_type} index out of range ({len(records)} results stored)")
+    return [records[i] for i in indices]
+
+
+def _itinerary_texts(itinerary_request: ItineraryRequest):
+    """
+    Prompt text for the flights and hotels of an itinerary request.
+
+    For each kind, in order of precedence: the selected options, the stored
+    results of ``*_result_id`` (the options at ``*_indices``, or else the best
+    ranked ones), then the free-text field.
+
+    Raises:
+        HTTPException: 400 if too many options are selected, indices are sent
+            without their result id or an index is out of range, 404 if a
+            result id is unknown
+    """
+    request = itinerary_request
+    if max(len(request.selected_flights), len(request.selected_hotels),
+           len(request.flight_indices), len(request.hotel_indices)) > MAX_SELECTED_OPTIONS:
+        raise HTTPException(
+            status_code=400, detail=f"Select at most {MAX_SELECTED_OPTIONS} flights and {MAX_SELECTED_OPTIONS} hotels"
+        )
+    if request.flight_indices and not request.flight_result_id:
+        raise HTTPException(status_code=400, detail="flight_indices requires flight_result_id")
+    if request.hotel_indices and not request.hotel_result_id:
+        raise HTTPException(status_code=400, detail="hotel_indices requires hotel_result_id")
+
+    if request.selected_flights:
+        flights_text = format_selected_flights(request.selected_flights)
+    elif request.flight_result_id:
+        records = load_flight_results(request.flight_result_id)
+        if request.flight_indices:
+            flights_text = format_selected_flights(
+                flight_records_to_models(_pick(records, request.flight_indices, "Flight"))
+            )
+        else:
+            flights_text = _flight_prompt(records)
+    else:
+        flights_text = request.flights if request.flights.strip() else format_selected_flights([])
+
+    if request.selected_hotels:
+        hotels_text = format_selected_hotels(request.selected_hotels)
+    elif request.hotel_result_id:
+        records = load_hotel_results(request.hotel_result_id)
+        if request.hotel_indices:
+            hotels_text = format_selected_hotels(
+                hotel_records_to_models(_pick(records, request.hotel_indices, "Hotel"))
+            )
+        else:
+            hotels_text = _hotel_prompt(records)
+    else:
+        hotels_text = request.hotels if request.hotels.strip() else format_selected_hotels([])
+    return flights_text, hotels_text
 
 
 @app.post("/generate_itinerary/", response_model=AIResponse)
 async def get_itinerary(itinerary_request: ItineraryRequest):
+    flights_text, hotels_text = _itinerary_texts(itinerary_request)
     itinerary = await generate_itinerary(
         itinerary_request.destination,
-        itinerary_request.flights,
-        itinerary_request.hotels,
+        flights_text,
+        hotels_text,
         itinerary_request.check_in_date,
         itinerary_request.check_out_date
     )
-    return AIResponse(itinerary=itinerary)
+    itinerary_id = store_itinerary(
+        itinerary_request.destination,
+        flights_text,
+        hotels_text,
+        itinerary_request.check_in_date,
+        itinerary_request.check_out_date,
+        itinerary
+    )
+    return _json_response(AIResponse.model_construct(itinerary=itinerary, itinerary_id=itinerary_id))
+
+
+@app.get("/itineraries/{itinerary_id}", response_model=StructuredItinerary)
+async def get_stored_itinerary(itinerary_id: str):
+    """Return a stored itinerary split into its day (or other '##') sections."""
+    return _json_response(get_itinerary_sections(itinerary_id))
+
+
+@app.post("/itineraries/{itinerary_id}/sections/{index}", response_model=StructuredItinerary)
+async def regenerate_itinerary_section(itinerary_id: str, index: int,
+                                       request: SectionRegenerationRequest = SectionRegenerationRequest()):
+    """Rewrite one section of a stored itinerary, keeping every other section as it was."""
+    return _json_response(await regenerate_section(itinerary_id, index, request.instructions))
+
+
+@app.post("/itineraries/{itinerary_id}/days/{day}", response_model=StructuredItinerary)
+async def regenerate_itinerary_day(itinerary_id: str, day: int,
+                                   request: SectionRegenerationRequest = SectionRegenerationRequest()):
+    """Rewrite the section for one day of a stored itinerary."""
+    index = find_day_section(itinerary_id, day)
+    return _json_response(await regenerate_section(itinerary_id, index, request.instructions))
+
+
+def _job_itinerary_id(job: dict) -> str:
+    """
+    Id of a completed job's stored itinerary, storing it on first use.
+
+    Workers run in other processes, which do not share an in-memory result
+    store, so the API stores the itinerary and records the id on the job.
+    """
+    if job["status"] != "completed":
+        return ""
+    if not job["itinerary_id"]:
+        itinerary_id = store_itinerary(itinerary=job["result"], **json.loads(job["payload"]))
+        itinerary_queue.set_itinerary_id(job["id"], itinerary_id)
+        # Another request may have recorded an id first; report the one that was kept
+        job = itinerary_queue.get(job["id"])
+    return job["itinerary_id"]
+
+
+def _itinerary_job_status(job: dict) -> ItineraryJobStatus:
+    started_at, finished_at = job["started_at"], job["finished_at"]
+    return ItineraryJobStatus(
+        job_id=job["id"],
+        status=job["status"],
+        itinerary=job["result"] or "",
+        itinerary_id=_job_itinerary_id(job),
+        error=job["error"] or "",
+        created_at=job["created_at"],
+        started_at=started_at,
+        finished_at=finished_at,
+        queue_seconds=started_at - job["created_at"] if started_at else None,
+        run_seconds=finished_at - started_at if started_at and finished_at else None
+    )
+
+
+@app.post("/itinerary_jobs/", response_model=ItineraryJobStatus, status_code=202)
+async def submit_itinerary_job(itinerary_request: ItineraryRequest):
+    """Queue an itinerary for generation by the worker processes."""
+    flights_text, hotels_text = _itinerary_texts(itinerary_request)
+    job_id = itinerary_queue.submit({
+        "destination": itinerary_request.destination,
+        "flights_text": flights_text,
+        "hotels_text": hotels_text,
+        "check_in_date": itinerary_request.check_in_date,
+        "check_out_date": itinerary_request.check_out_date
+    })
+    return _itinerary_job_status(itinerary_queue.get(job_id))
+
+
+@app.get("/itinerary_jobs/{job_id}", response_model=ItineraryJobStatus)
+async def get_itinerary_job(job_id: str):
+    job = itinerary_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Itinerary job not found")
+    return _itinerary_job_status(job)
+
+
+@app.delete("/itinerary_jobs/{job_id}", response_model=ItineraryJobStatus)
+async def cancel_itinerary_job(job_id: str):
+    job = itinerary_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Itinerary job not found")
+    if not itinerary_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Itinerary job already {job['status']}")
+    return _itinerary_job_status(itinerary_queue.get(job_id))
+
+
+@app.post("/plan_trip/", response_model=AIResponse)
+async def plan_trip(trip_request: TripRequest):
+    """Search flights and hotels concurrently, analyze both, then build the itinerary."""
+    check_in_date = trip_request.check_in_date or trip_request.outbound_date
+    check_out_date = trip_request.check_out_date or trip_request.return_date
+
+    flight_request = FlightRequest(
+        origin=trip_request.origin,
+        destination=trip_request.destination,
+        outbound_date=trip_request.outbound_date,
+        return_date=trip_request.return_date
+    )
+    hotel_request = HotelRequest(
+        location=trip_request.destination,
+        check_in_date=check_in_date,
+        check_out_date=check_out_date
+    )
+
+    # Each branch runs search -> transform -> AI analysis, so both searches
+    # and both AI recommendations overlap
+    flight_results, hotel_results = await asyncio.gather(
+        _flight_results(flight_request),
+        _hotel_results(hotel_request)
+    )
+    flights, flights_text, ai_flight_recommendation = flight_results
+    hotels, hotels_text, ai_hotel_recommendation = hotel_results
+
+    destination = convert_airport_code_to_city(trip_request.destination)
+    itinerary = await generate_itinerary(
+        destination,
+        flights_text,
+        hotels_text,
+        check_in_date,
+        check_out_date
+    )
+    itinerary_id = store_itinerary(destination, flights_text, hotels_text, check_in_date, check_out_date, itinerary)
+    return _json_response(AIResponse.model_construct(
+        flights=flights,
+        hotels=hotels,
+        ai_flight_recommendation=ai_flight_recommendation,
+        ai_hotel_recommendation=ai_hotel_recommendation,
+        itinerary=itinerary,
+        itinerary_id=itinerary_id
+    ))
+
+
+@app.post("/plan_multi_city_trip/", response_model=MultiCityTripResponse)
+async def multi_city_trip(trip_request: MultiCityTripRequest):
+    """Search every flight leg and every city's hotels concurrently, then build one itinerary."""
+    return _json_response(await plan_multi_city_trip(trip_request))
+
+
+@app.post("/stream/search_flights/")
+async def stream_flight_recommendations(flight_request: FlightRequest):
+    """Stream flights as soon as they are found, then the AI recommendation by section."""
+    async def events():
+        yield sse_event("status", {"stage": "searching"})
+        records = await search_flight_records(flight_request)
+        yield sse_event("result", {"result_id": save_flight_results(flight_request, records)})
+        flights = _with_stored_index(flight_records_to_models(records), records, _stored_positions(records))
+        yield sse_event("flights", [flight.model_dump() for flight in flights])
+        flights_text = _flight_prompt(records)
+        yield sse_event("status", {"stage": "analyzing"})
+        async for frame in stream_markdown_result(
+            "ai_flight_recommendation", get_ai_recommendation("flights", flights_text)
+        ):
+            yield frame
+
+    return _sse_response(events())
+
+
+@app.post("/stream/search_hotels/")
+async def stream_hotel_recommendations(hotel_request: HotelRequest):
+    """Stream hotels as soon as they are found, then the AI recommendation by section."""
+    async def events():
+        yield sse_event("status", {"stage": "searching"})
+        records = await search_hotel_records(hotel_request)
+        yield sse_event("result", {"result_id": save_hotel_results(hotel_request, records)})
+        hotels = _with_stored_index(hotel_records_to_models(records), records, _stored_positions(records))
+        yield sse_event("hotels", [hotel.model_dump() for hotel in hotels])
+        hotels_text = _hotel_prompt(records)
+        yield sse_event("status", {"stage": "analyzing"})
+        async for frame in stream_markdown_result(
+            "ai_hotel_recommendation", get_ai_recommendation("hotels", hotels_text)
+        ):
+            yield frame
+
+    return _sse_response(events())
+
+
+@app.post("/stream/generate_itinerary/")
+async def stream_itinerary(itinerary_request: ItineraryRequest):
+    """Stream the itinerary section by section, then the id it is stored under."""
+    # Validate before the stream starts so errors get a proper status code
+    flights_text, hotels_text = _itinerary_texts(itinerary_request)
+
+    async def events():
+        yield sse_event("status", {"stage": "generating"})
+        itinerary = asyncio.ensure_future(generate_itinerary(
+            itinerary_request.destination,
+            flights_text,
+            hotels_text,
+            itinerary_request.check_in_date,
+            itinerary_request.check_out_date
+        ))
+        async for frame in stream_markdown_result("itinerary", itinerary):
+            yield frame
+        itinerary_id = store_itinerary(
+            itinerary_request.destination,
+            flights_text,
+            hotels_text,
+            itinerary_request.check_in_date,
+            itinerary_request.check_out_date,
+            itinerary.result()
+        )
+        yield sse_event("itinerary_id", {"itinerary_id": itinerary_id})
+
+    return _sse_response(events())
 
 
 # Run FastAPI Server
@@ -2,20 +2,119 @@ import os
 import logging
 from functools import lru_cache
 from crewai import LLM
+from .constants import DEFAULT_FLIGHT_RANKING_WEIGHTS, DEFAULT_HOTEL_RANKING_WEIGHTS
+from .logging_setup import PayloadSampler, configure_logging, log_payload as _log_payload
+from .utils.tracing import configure_tracing
 
 # Load API Keys
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 SERP_API_KEY = os.environ.get("SERP_API_KEY")
 
+# SerpAPI HTTP client
+SERPAPI_BASE_URL = os.environ.get("SERPAPI_BASE_URL", "https://serpapi.com")
+SERPAPI_TIMEOUT = float(os.environ.get("SERPAPI_TIMEOUT", "30"))
+SERPAPI_MAX_CONNECTIONS = int(os.environ.get("SERPAPI_MAX_CONNECTIONS", "20"))
+
+# Search result cache ("memory", "sqlite" or "none")
+SEARCH_CACHE_BACKEND = os.environ.get("SEARCH_CACHE_BACKEND", "memory")
+SEARCH_CACHE_MAX_SIZE = int(os.environ.get("SEARCH_CACHE_MAX_SIZE", "512"))
+SEARCH_CACHE_PATH = os.environ.get("SEARCH_CACHE_PATH", "search_cache.sqlite3")
+
+# AI response cache ("memory", "sqlite" or "none")
+AI_CACHE_BACKEND = os.environ.get("AI_CACHE_BACKEND", "memory")
+AI_CACHE_MAX_SIZE = int(os.environ.get("AI_CACHE_MAX_SIZE", "256"))
+AI_CACHE_TTL = int(os.environ.get("AI_CACHE_TTL", str(6 * 60 * 60)))
+AI_CACHE_PATH = os.environ.get("AI_CACHE_PATH", "ai_cache.sqlite3")
+
+# Server-side store of search results referenced by result_id ("memory" or "sqlite")
+RESULT_STORE_BACKEND = os.environ.get("RESULT_STORE_BACKEND", "memory")
+RESULT_STORE_MAX_SIZE = int(os.environ.get("RESULT_STORE_MAX_SIZE", "1000"))
+RESULT_STORE_TTL = int(os.environ.get("RESULT_STORE_TTL", str(2 * 60 * 60)))
+RESULT_STORE_PATH = os.environ.get("RESULT_STORE_PATH", "result_store.sqlite3")
+
+# Store of generated itineraries referenced by itinerary_id ("memory" or "sqlite")
+ITINERARY_STORE_BACKEND = os.environ.get("ITINERARY_STORE_BACKEND", "memory")
+ITINERARY_STORE_MAX_SIZE = int(os.environ.get("ITINERARY_STORE_MAX_SIZE", "500"))
+ITINERARY_STORE_TTL = int(os.environ.get("ITINERARY_STORE_TTL", str(24 * 60 * 60)))
+ITINERARY_STORE_PATH = os.environ.get("ITINERARY_STORE_PATH", "itinerary_store.sqlite3")
+
+# Concurrency limits for upstream calls; calls beyond workers + queue get HTTP 503
+SEARCH_MAX_WORKERS = int(os.environ.get("SEARCH_MAX_WORKERS", "8"))
+SEARCH_MAX_QUEUE = int(os.environ.get("SEARCH_MAX_QUEUE", "32"))
+LLM_MAX_WORKERS = int(os.environ.get("LLM_MAX_WORKERS", "4"))
+LLM_MAX_QUEUE = int(os.environ.get("LLM_MAX_QUEUE", "16"))
+EXECUTOR_RETRY_AFTER = int(os.environ.get("EXECUTOR_RETRY_AFTER", "5"))
+
+# Searches one flexible-date, batch or multi-city request runs at once, leaving search queue room for other requests
+FLEX_SEARCH_CONCURRENCY = int(os.environ.get("FLEX_SEARCH_CONCURRENCY", "4"))
+BATCH_SEARCH_CONCURRENCY = int(os.environ.get("BATCH_SEARCH_CONCURRENCY", "4"))
+
+# Result sets analyzed together in one LLM call by batch requests
+AI_BATCH_SIZE = int(os.environ.get("AI_BATCH_SIZE", "5"))
+
+# Size limits of the flight/hotel data sent to the LLM (approximate tokens, candidates per list)
+AI_PROMPT_TOKEN_BUDGET = int(os.environ.get("AI_PROMPT_TOKEN_BUDGET", "800"))
+AI_PROMPT_MAX_CANDIDATES = int(os.environ.get("AI_PROMPT_MAX_CANDIDATES", "20"))
+
+def _parse_weights(value, default):
+    """Parse 'criterion=weight,...' (e.g. 'price=0.6,duration=0.4'); criteria left out get weight 0."""
+    if not value:
+        return dict(default)
+    weights = dict.fromkeys(default, 0.0)
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        criterion, _, weight = item.partition("=")
+        if criterion.strip() in weights:
+            weights[criterion.strip()] = float(weight)
+    return weights
+
+
+# Weights of the local ranking used for ``mode=fast`` and for ordering AI prompt candidates
+FLIGHT_RANKING_WEIGHTS = _parse_weights(os.environ.get("FLIGHT_RANKING_WEIGHTS"), DEFAULT_FLIGHT_RANKING_WEIGHTS)
+HOTEL_RANKING_WEIGHTS = _parse_weights(os.environ.get("HOTEL_RANKING_WEIGHTS"), DEFAULT_HOTEL_RANKING_WEIGHTS)
+
+# Seconds a finished background recommendation stays available for polling
+RECOMMENDATION_JOB_TTL = int(os.environ.get("RECOMMENDATION_JOB_TTL", "600"))
+
+# Itinerary job queue; set ITINERARY_WORKERS=0 to run workers separately from the API
+ITINERARY_QUEUE_PATH = os.environ.get("ITINERARY_QUEUE_PATH", "itinerary_jobs.sqlite3")
+ITINERARY_WORKERS = int(os.environ.get("ITINERARY_WORKERS", "2"))
+ITINERARY_POLL_INTERVAL = float(os.environ.get("ITINERARY_POLL_INTERVAL", "0.5"))
+# A running job whose worker has not sent a heartbeat for this many seconds is
+# requeued, or failed once it has been claimed ITINERARY_JOB_MAX_ATTEMPTS times
+ITINERARY_JOB_LEASE = float(os.environ.get("ITINERARY_JOB_LEASE", "60"))
+ITINERARY_JOB_MAX_ATTEMPTS = int(os.environ.get("ITINERARY_JOB_MAX_ATTEMPTS", "2"))
+
+# LLM model used for all AI agents
+GEMINI_MODEL = "gemini/gemini-2.0-flash"
+
+# Logging: "text" or "json" output; raw payloads are logged at DEBUG for 1 in N requests (0 disables)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+LOG_PAYLOAD_SAMPLE_RATE = int(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", "10"))
+LOG_PAYLOAD_MAX_CHARS = int(os.environ.get("LOG_PAYLOAD_MAX_CHARS", "2000"))
+
+# Tracing: spans for each stage are written to TRACE_FILE in Chrome trace format
+TRACE_ENABLED = os.environ.get("TRACE_ENABLED", "0").lower() in ("1", "true", "yes")
+TRACE_FILE = os.environ.get("TRACE_FILE", "traces.json")
+
 # Initialize Logger
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+configure_logging(LOG_LEVEL, LOG_FORMAT)
 logger = logging.getLogger(__name__)
+payload_sampler = PayloadSampler(LOG_PAYLOAD_SAMPLE_RATE)
+
+# Initialize Tracing
+configure_tracing(TRACE_ENABLED, TRACE_FILE)
+
+
+def log_payload(label, payload):
+    """Log a raw payload at DEBUG level, sampled per request and truncated."""
+    _log_payload(logger, label, payload, payload_sampler, LOG_PAYLOAD_MAX_CHARS)
 
 @lru_cache(maxsize=1)
 def initialize_llm():
     """Initialize and cache the LLM instance to avoid repeated initializations."""
     return LLM(
-        model="gemini/gemini-2.0-flash",
+        model=GEMINI_MODEL,
         provider="google",
         api_key=GEMINI_API_KEY
     )
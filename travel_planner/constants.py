@@ -193,5 +193,55 @@ SEARCH_ENGINES = {
     "hotels": "google_hotels"
 }
 
+# SerpAPI Google Flights trip types
+FLIGHT_TRIP_TYPES = {
+    "round_trip": 1,
+    "one_way": 2
+}
+
+# Search result cache lifetimes in seconds, per SerpAPI engine
+SEARCH_CACHE_TTLS = {
+    "google_flights": 15 * 60,   # Fares move quickly
+    "google_hotels": 60 * 60     # Hotel listings are more stable
+}
+
+DEFAULT_SEARCH_CACHE_TTL = 15 * 60
+
+# Seconds between keep-alive comments on streaming (SSE) responses
+SSE_KEEPALIVE_INTERVAL = 5
+
+# Default weight of each criterion when ranking results locally (lower cost wins)
+DEFAULT_FLIGHT_RANKING_WEIGHTS = {
+    "price": 0.5,
+    "duration": 0.3,
+    "stops": 0.2
+}
+
+DEFAULT_HOTEL_RANKING_WEIGHTS = {
+    "price": 0.5,
+    "rating": 0.5
+}
+
+# Default and maximum number of flights or hotels per response page
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Flexible-date flight search: largest +/- day window and number of best date pairs returned
+MAX_FLEX_DAYS = 3
+FLEX_BEST_OPTIONS = 5
+
+# Most flight or hotel searches accepted in one batch request
+MAX_BATCH_SIZE = 50
+
+# Most cities in a multi-city trip, and flights or hotels per leg or city in its itinerary prompt
+MAX_TRIP_CITIES = 6
+MULTI_CITY_MAX_CANDIDATES = 5
+
+# Most selected flights or hotels accepted for one itinerary
+MAX_SELECTED_OPTIONS = 10
+
+# Rough characters per LLM token, used to keep prompts within a token budget
+CHARS_PER_TOKEN = 4
+
 # Default country code for unknown locations
 DEFAULT_COUNTRY_CODE = "us"
@@ -0,0 +1,145 @@
+"""
+Logging configuration and helpers for logging large payloads cheaply.
+
+Records are handed to a background thread through a queue unformatted, so
+message formatting, JSON serialization and handler I/O never run on the
+request path. Large payloads (e.g. raw SerpAPI responses) are only
+stringified when the record is actually emitted, are sampled per request and
+are rendered with a size-bounded repr.
+"""
+
+import atexit
+import contextvars
+import copy
+import itertools
+import json
+import logging
+import queue
+import reprlib
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_STANDARD_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_payload_sampled = contextvars.ContextVar("payload_sampled", default=None)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue records without formatting them.
+
+    ``QueueHandler.prepare`` formats the message in the logging thread and
+    drops ``args`` and ``exc_info``. Here the record is only copied (so other
+    handlers of the logger see it unchanged), and the listener's handler
+    formats it, tracebacks included. Log arguments are therefore rendered
+    after the call returns, which is safe for the immutable values and
+    ``TruncatedPayload`` wrappers this app logs.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+class TruncatedPayload:
+    """
+    Defer rendering of a payload until a log record is emitted.
+
+    Rendering uses a size-bounded repr, so even very large nested structures
+    cost a bounded amount of CPU, and the result is capped at ``max_chars``.
+    """
+
+    __slots__ = ("payload", "max_chars")
+
+    _repr = reprlib.Repr()
+    _repr.maxlevel = 4
+    _repr.maxdict = 20
+    _repr.maxlist = 10
+    _repr.maxstring = 200
+    _repr.maxother = 200
+
+    def __init__(self, payload, max_chars: int):
+        self.payload = payload
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        text = self._repr.repr(self.payload)
+        if len(text) > self.max_chars:
+            return f"{text[:self.max_chars]}... [truncated]"
+        return text
+
+
+class PayloadSampler:
+    """Select 1 in ``rate`` requests for payload logging (0 disables payload logs)."""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self._counter = itertools.count()
+
+    def sample(self) -> bool:
+        if self.rate <= 0:
+            return False
+        return next(self._counter) % self.rate == 0
+
+
+def configure_logging(level: str = "INFO", fmt: str = "text") -> None:
+    """
+    Route all logging through a non-blocking queue handler.
+
+    Args:
+        level: Root log level name
+        fmt: 'text' for human-readable lines or 'json' for structured output
+    """
+    handler = logging.StreamHandler()
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.handlers = [DeferredQueueHandler(log_queue)]
+    root.setLevel(level.upper())
+
+
+def begin_request_sampling(sampler: PayloadSampler) -> None:
+    """Decide once for the current request whether its payloads are logged."""
+    _payload_sampled.set(sampler.sample())
+
+
+def log_payload(logger: logging.Logger, label: str, payload, sampler: PayloadSampler,
+                max_chars: int, level: int = logging.DEBUG) -> None:
+    """
+    Log a large payload lazily, sampled and truncated.
+
+    Nothing is stringified unless the level is enabled and the current
+    request was sampled (outside a request, each call is sampled on its own).
+    """
+    if not logger.isEnabledFor(level):
+        return
+    sampled = _payload_sampled.get()
+    if sampled is None:
+        sampled = sampler.sample()
+    if sampled:
+        logger.log(level, "%s: %s", label, TruncatedPayload(payload, max_chars))
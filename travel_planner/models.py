@@ -1,23 +1,54 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
+from .constants import DEFAULT_PAGE_SIZE
+
+# "ai" asks the LLM for a recommendation; "fast" ranks results locally; "none" skips it
+RecommendationMode = Literal["ai", "fast", "none"]
+
+# Result orderings; "rank" is the local ranking used by mode=fast
+FlightSortKey = Literal["price", "duration", "stops", "departure", "rank"]
+HotelSortKey = Literal["price", "rating", "reviews", "rank"]
 
 class FlightRequest(BaseModel):
+    origin: str
+    destination: str
+    outbound_date: str
+    # One-way search when omitted
+    return_date: Optional[str] = None
+
+class FlexibleFlightRequest(BaseModel):
     origin: str
     destination: str
     outbound_date: str
     return_date: str
+    # Both dates are searched this many days earlier and later
+    flex_days: int = 3
 
 class HotelRequest(BaseModel):
     location: str
     check_in_date: str
     check_out_date: str
 
-class ItineraryRequest(BaseModel):
+class TripRequest(BaseModel):
+    origin: str
     destination: str
+    outbound_date: str
+    return_date: str
+    # Hotel stay defaults to the flight dates
+    check_in_date: Optional[str] = None
+    check_out_date: Optional[str] = None
+
+class TripStop(BaseModel):
+    # Airport code or city name
+    city: str
     check_in_date: str
     check_out_date: str
-    flights: str
-    hotels: str
+
+class MultiCityTripRequest(BaseModel):
+    origin: str
+    # Cities in visiting order
+    stops: List[TripStop]
+    return_to_origin: bool = True
 
 class FlightInfo(BaseModel):
     airline: str
@@ -29,6 +60,8 @@ class FlightInfo(BaseModel):
     travel_class: str
     return_date: str
     airline_logo: str
+    # Position in the stored results of the response's result_id, for flight_indices
+    index: Optional[int] = None
 
 class HotelInfo(BaseModel):
     name: str
@@ -36,6 +69,41 @@ class HotelInfo(BaseModel):
     rating: float
     location: str
     link: str
+    # Position in the stored results of the response's result_id, for hotel_indices
+    index: Optional[int] = None
+
+class ItineraryRequest(BaseModel):
+    destination: str
+    check_in_date: str
+    check_out_date: str
+    # Options picked from search results; the prompt text is built from them server-side
+    selected_flights: List[FlightInfo] = []
+    selected_hotels: List[HotelInfo] = []
+    # Stored search results (see /results/), used when no options are selected.
+    # Indices are the ``index`` of the options in responses carrying that result_id;
+    # the best ranked options are used without them.
+    flight_result_id: Optional[str] = None
+    flight_indices: List[int] = []
+    hotel_result_id: Optional[str] = None
+    hotel_indices: List[int] = []
+    # Free-text details, used when neither options nor a result id are given
+    flights: str = ""
+    hotels: str = ""
+
+class FlightFilters(BaseModel):
+    max_price: Optional[float] = None
+    max_stops: Optional[int] = None
+    airline: Optional[str] = None
+    sort: Optional[FlightSortKey] = None
+
+class HotelFilters(BaseModel):
+    max_price: Optional[float] = None
+    min_rating: Optional[float] = None
+    sort: Optional[HotelSortKey] = None
+
+class Pagination(BaseModel):
+    page: int = 1
+    page_size: int = DEFAULT_PAGE_SIZE
 
 class AIResponse(BaseModel):
     flights: List[FlightInfo] = []
@@ -43,3 +111,114 @@ class AIResponse(BaseModel):
     ai_flight_recommendation: str = ""
     ai_hotel_recommendation: str = ""
     itinerary: str = ""
+    # Set when the AI recommendation is computed in the background
+    recommendation_id: str = ""
+    # Id of the stored itinerary, for regenerating single days via /itineraries/
+    itinerary_id: str = ""
+    # Id of the stored search results, for paging or re-ranking via /results/
+    result_id: str = ""
+    # Paging of the returned flights or hotels; total_results counts matches across all pages
+    total_results: int = 0
+    page: int = 1
+    page_size: int = 0
+
+class FlightLeg(BaseModel):
+    origin: str
+    destination: str
+    date: str
+    flights: List[FlightInfo] = []
+
+class CityStay(BaseModel):
+    city: str
+    check_in_date: str
+    check_out_date: str
+    hotels: List[HotelInfo] = []
+
+class MultiCityTripResponse(BaseModel):
+    legs: List[FlightLeg]
+    stays: List[CityStay]
+    itinerary: str = ""
+    itinerary_id: str = ""
+
+class BatchFlightRequest(BaseModel):
+    requests: List[FlightRequest]
+    # Analyze the result sets with the LLM, several per call
+    ai: bool = False
+    max_results: int = DEFAULT_PAGE_SIZE
+
+class BatchHotelRequest(BaseModel):
+    requests: List[HotelRequest]
+    ai: bool = False
+    max_results: int = DEFAULT_PAGE_SIZE
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: str  # "completed" or "failed"
+    flights: List[FlightInfo] = []
+    hotels: List[HotelInfo] = []
+    total_results: int = 0
+    ai_recommendation: str = ""
+    error: str = ""
+    # Index of the earlier identical request whose results were reused
+    duplicate_of: Optional[int] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+    unique_searches: int
+    failed: int
+
+class DateOption(BaseModel):
+    outbound_date: str
+    return_date: str
+    flight: FlightInfo
+
+class PriceCalendar(BaseModel):
+    outbound_dates: List[str]
+    return_dates: List[str]
+    # Cheapest fare per [outbound][return] date pair; None if not searched or no priced fare
+    prices: List[List[Optional[float]]]
+    # Cheapest flight of the cheapest date pairs, cheapest first
+    best_options: List[DateOption] = []
+    searches: int = 0
+    failed_searches: int = 0
+
+class ItinerarySection(BaseModel):
+    index: int
+    title: str
+    # Day number from the heading, None for sections such as general tips
+    day: Optional[int] = None
+    markdown: str
+
+class StructuredItinerary(BaseModel):
+    itinerary_id: str
+    destination: str
+    check_in_date: str
+    check_out_date: str
+    # Text before the first section (title and overview)
+    preamble: str
+    sections: List[ItinerarySection]
+    # The full markdown document
+    itinerary: str
+
+class SectionRegenerationRequest(BaseModel):
+    instructions: str = ""
+
+class RecommendationStatus(BaseModel):
+    recommendation_id: str
+    data_type: str
+    status: str  # "pending", "completed" or "failed"
+    recommendation: str = ""
+    error: str = ""
+
+class ItineraryJobStatus(BaseModel):
+    job_id: str
+    status: str  # "queued", "running", "completed", "failed" or "cancelled"
+    itinerary: str = ""
+    # Id of the stored itinerary once completed, for regenerating single days via /itineraries/
+    itinerary_id: str = ""
+    error: str = ""
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    queue_seconds: Optional[float] = None
+    run_seconds: Optional[float] = None
@@ -1,19 +1,22 @@
 import asyncio
+import re
+import threading
 from datetime import datetime
+from typing import List, Optional
 from crewai import Agent, Task, Crew, Process
-from ..config import initialize_llm, logger
+from ..config import (
+    initialize_llm, logger, GEMINI_MODEL,
+    AI_CACHE_BACKEND, AI_CACHE_MAX_SIZE, AI_CACHE_TTL, AI_CACHE_PATH, AI_BATCH_SIZE
+)
+from .executors import llm_executor
+from ..utils.cache import create_cache, make_cache_key
+from ..utils.singleflight import SingleFlight
+from ..utils.metrics import STAGE_LATENCY, UPSTREAM_ERRORS
+from ..utils.tracing import span, traced
+from ..utils.itinerary import parse_itinerary
 
 
-async def get_ai_recommendation(data_type, formatted_data):
-    logger.info(f"Getting {data_type} analysis from AI")
-    llm_model = initialize_llm()
-
-    # Configure agent based on data type
-    if data_type == "flights":
-        role = "AI Flight Analyst"
-        goal = "Analyze flight options and recommend the best one considering price, duration, stops, and overall convenience."
-        backstory = f"AI expert that provides in-depth analysis comparing flight options based on multiple factors."
-        description = """
+FLIGHT_ANALYSIS_PROMPT = """
         Recommend the best flight from the available options, based on the details provided below:
 
         **Reasoning for Recommendation:**
@@ -24,11 +27,8 @@ async def get_ai_recommendation(data_type, formatted_data):
 
         Use the provided flight data as the basis for your recommendation. Be sure to justify your choice using clear reasoning for each attribute. Do not repeat the flight details in your response.
         """
-    elif data_type == "hotels":
-        role = "AI Hotel Analyst"
-        goal = "Analyze hotel options and recommend the best one considering price, rating, location, and amenities."
-        backstory = f"AI expert that provides in-depth analysis comparing hotel options based on multiple factors."
-        description = """
+
+HOTEL_ANALYSIS_PROMPT = """
         Based on the following analysis, generate a detailed recommendation for the best hotel. Your response should include clear reasoning based on price, rating, location, and amenities.
 
         **AI Hotel Recommendation**
@@ -46,58 +46,8 @@ async def get_ai_recommendation(data_type, formatted_data):
         - Provide concise, well-structured reasoning to make the recommendation clear to the traveler.
         - Your recommendation should help a traveler make an informed decision based on multiple factors, not just one.
         """
-    else:
-        raise ValueError("Invalid data type for AI recommendation")
-
-    # Create the agent and task
-    analyze_agent = Agent(
-        role=role,
-        goal=goal,
-        backstory=backstory,
-        llm=llm_model,
-        verbose=False
-    )
-
-    analyze_task = Task(
-        description=f"{description}\n\nData to analyze:\n{formatted_data}",
-        agent=analyze_agent,
-        expected_output=f"A structured recommendation explaining the best {data_type} choice based on the analysis of provided details."
-    )
-
-    # Define CrewAI Workflow for the agent
-    analyst_crew = Crew(
-        agents=[analyze_agent],
-        tasks=[analyze_task],
-        process=Process.sequential,
-        verbose=False
-    )
-
-    # Execute CrewAI Process
-    crew_results = await asyncio.to_thread(analyst_crew.kickoff)
-    return str(crew_results)
-
 
-async def generate_itinerary(destination, flights_text, hotels_text, check_in_date, check_out_date):
-    """Generate a detailed travel itinerary based on flight and hotel information."""
-    # Convert the string dates to datetime objects
-    check_in = datetime.strptime(check_in_date, "%Y-%m-%d")
-    check_out = datetime.strptime(check_out_date, "%Y-%m-%d")
-
-    # Calculate the difference in days
-    days = (check_out - check_in).days
-
-    llm_model = initialize_llm()
-
-    analyze_agent = Agent(
-        role="AI Travel Planner",
-        goal="Create a detailed itinerary for the user based on flight and hotel information",
-        backstory="AI travel expert generating a day-by-day itinerary including flight details, hotel stays, and must-visit locations in the destination.",
-        llm=llm_model,
-        verbose=False
-    )
-
-    analyze_task = Task(
-        description=f"""
+ITINERARY_PROMPT = """
         Based on the following details, create a {days}-day itinerary for the user:
 
         **Flight Details**:
@@ -124,17 +74,320 @@ async def generate_itinerary(destination, flights_text, hotels_text, check_in_da
         - Use bullet points for listing activities
         - Include estimated timings for each activity
         - Format the itinerary to be visually appealing and easy to read
-        """,
-        agent=analyze_agent,
-        expected_output="A well-structured, visually appealing itinerary in markdown format, including flight, hotel, and day-wise breakdown with emojis, headers, and bullet points."
-    )
+        """
+
+SECTION_PROMPT = """
+        Rewrite one section of an existing {days}-day itinerary for {destination} ({check_in_date} to {check_out_date}).
+
+        **Flight Details**:
+        {flights_text}
+
+        **Hotel Details**:
+        {hotels_text}
+
+        **Outline of the Whole Itinerary**:
+        {outline}
+
+        **Current Version of the Section**:
+        {section}
+
+        **Requested Changes**: {instructions}
+
+        **Format Requirements**:
+        - Return only the rewritten section, starting with the heading line `## {title}`
+        - Keep the style of the rest of the itinerary: ### for sections, bullet points, estimated timings and emojis
+        - Avoid repeating activities planned on other days
+        """
 
-    itinerary_planner_crew = Crew(
-            agents=[analyze_agent],
-            tasks=[analyze_task],
-            process=Process.sequential,
+BATCH_ANALYSIS_PROMPT = """
+        The data below holds {count} separate searches, each introduced by a marker line such as "=== Search 1 ===".
+        For each search, in order, write the recommendation described below based only on that search's data.
+        Start each recommendation with the search's marker line on its own and write nothing before the first marker.
+        {analysis_prompt}
+        """
+
+# Static configuration of each agent; only the task prompt varies per request
+AGENT_PROFILES = {
+    "flights": {
+        "role": "AI Flight Analyst",
+        "goal": "Analyze flight options and recommend the best one considering price, duration, stops, and overall convenience.",
+        "backstory": "AI expert that provides in-depth analysis comparing flight options based on multiple factors.",
+        "expected_output": "A structured recommendation explaining the best flights choice based on the analysis of provided details."
+    },
+    "hotels": {
+        "role": "AI Hotel Analyst",
+        "goal": "Analyze hotel options and recommend the best one considering price, rating, location, and amenities.",
+        "backstory": "AI expert that provides in-depth analysis comparing hotel options based on multiple factors.",
+        "expected_output": "A structured recommendation explaining the best hotels choice based on the analysis of provided details."
+    },
+    "itinerary": {
+        "role": "AI Travel Planner",
+        "goal": "Create a detailed itinerary for the user based on flight and hotel information",
+        "backstory": "AI travel expert generating a day-by-day itinerary including flight details, hotel stays, and must-visit locations in the destination.",
+        "expected_output": "A well-structured, visually appealing itinerary in markdown format, including flight, hotel, and day-wise breakdown with emojis, headers, and bullet points."
+    }
+}
+
+ANALYSIS_PROMPTS = {
+    "flights": FLIGHT_ANALYSIS_PROMPT,
+    "hotels": HOTEL_ANALYSIS_PROMPT
+}
+
+# Content-addressed cache of LLM outputs keyed on data type, prompt and model
+ai_cache = create_cache(
+    AI_CACHE_BACKEND,
+    max_size=AI_CACHE_MAX_SIZE,
+    default_ttl=AI_CACHE_TTL,
+    path=AI_CACHE_PATH
+)
+
+# Coalesces concurrent AI requests for identical prompts
+ai_singleflight = SingleFlight()
+
+# Agents are built once per worker thread and reused across requests.
+# Crew.kickoff mutates agent state, so agents are not shared between threads.
+_agent_registry = threading.local()
+
+
+def get_agent(agent_type):
+    """
+    Return the calling thread's agent for ``agent_type``, building it on first use.
+
+    Args:
+        agent_type: One of the keys of AGENT_PROFILES
+
+    Returns:
+        A configured CrewAI Agent bound to the cached LLM
+    """
+    agents = getattr(_agent_registry, "agents", None)
+    if agents is None:
+        agents = _agent_registry.agents = {}
+
+    agent = agents.get(agent_type)
+    if agent is None:
+        profile = AGENT_PROFILES[agent_type]
+        agent = Agent(
+            role=profile["role"],
+            goal=profile["goal"],
+            backstory=profile["backstory"],
+            llm=initialize_llm(),
             verbose=False
         )
+        agents[agent_type] = agent
+    return agent
+
+
+def run_agent_task(agent_type, prompt):
+    """
+    Bind a prompt to the registered agent and run it through a single-task crew.
+
+    This call blocks on the LLM and must run in a worker thread
+    (see ``llm_executor``).
 
-    crew_results = await asyncio.to_thread(itinerary_planner_crew.kickoff)
-    return str(crew_results)
+    Args:
+        agent_type: One of the keys of AGENT_PROFILES
+        prompt: Fully rendered task description
+
+    Returns:
+        The crew output as a string
+    """
+    agent = get_agent(agent_type)
+    task = Task(
+        description=prompt,
+        agent=agent,
+        expected_output=AGENT_PROFILES[agent_type]["expected_output"]
+    )
+    crew = Crew(
+        agents=[agent],
+        tasks=[task],
+        process=Process.sequential,
+        verbose=False
+    )
+    try:
+        with STAGE_LATENCY.time(stage=f"crew_kickoff_{agent_type}"), span("crew_kickoff", agent=agent_type):
+            return str(crew.kickoff())
+    except Exception:
+        UPSTREAM_ERRORS.inc(service="llm")
+        raise
+
+
+def build_ai_cache_key(data_type, prompt, llm_model):
+    """Fingerprint an AI request by data type, full prompt text and model name."""
+    model_name = getattr(llm_model, "model", GEMINI_MODEL)
+    return make_cache_key({"data_type": data_type, "prompt": prompt, "model": model_name})
+
+
+async def run_agent_cached(agent_type, prompt):
+    """
+    Run a prompt through the registered agent, reusing a cached result for an identical prompt.
+
+    Args:
+        agent_type: One of the keys of AGENT_PROFILES
+        prompt: Fully rendered task description
+
+    Returns:
+        The agent output as a string
+    """
+    cache_key = build_ai_cache_key(agent_type, prompt, initialize_llm())
+    with span("ai_request", agent=agent_type, prompt_fingerprint=cache_key) as ai_span:
+        cached_result = ai_cache.get(cache_key)
+        if ai_span is not None:
+            ai_span.set("cache_hit", cached_result is not None)
+        if cached_result is not None:
+            logger.info("AI cache hit")
+            return cached_result
+
+        async def kickoff():
+            result = await llm_executor.run(run_agent_task, agent_type, prompt)
+            ai_cache.set(cache_key, result)
+            return result
+
+        return await ai_singleflight.do(cache_key, kickoff)
+
+
+@traced("get_ai_recommendation")
+async def get_ai_recommendation(data_type, formatted_data):
+    logger.info("Getting %s analysis from AI", data_type)
+
+    if data_type not in ANALYSIS_PROMPTS:
+        raise ValueError("Invalid data type for AI recommendation")
+
+    prompt = f"{ANALYSIS_PROMPTS[data_type]}\n\nData to analyze:\n{formatted_data}"
+    return await run_agent_cached(data_type, prompt)
+
+
+_BATCH_MARKER = re.compile(r"^\s*=+\s*Search\s+(\d+)\s*=+\s*$", re.MULTILINE | re.IGNORECASE)
+
+
+def split_batch_response(text: str, count: int) -> List[Optional[str]]:
+    """
+    Split a batched LLM answer at its "=== Search N ===" marker lines.
+
+    Args:
+        text: LLM output for a batch prompt
+        count: Number of searches in the batch
+
+    Returns:
+        The recommendation for each search in order, None where the marker is missing
+    """
+    sections: List[Optional[str]] = [None] * count
+    markers = list(_BATCH_MARKER.finditer(text))
+    for marker, following in zip(markers, markers[1:] + [None]):
+        position = int(marker.group(1)) - 1
+        end = following.start() if following else len(text)
+        section = text[marker.end():end].strip()
+        if 0 <= position < count and section and sections[position] is None:
+            sections[position] = section
+    return sections
+
+
+async def _batch_recommendations(data_type: str, formatted_items: List[str]) -> List[str]:
+    if len(formatted_items) == 1:
+        return [await get_ai_recommendation(data_type, formatted_items[0])]
+
+    data = "\n\n".join(f"=== Search {i} ===\n{text}" for i, text in enumerate(formatted_items, 1))
+    prompt = BATCH_ANALYSIS_PROMPT.format(count=len(formatted_items), analysis_prompt=ANALYSIS_PROMPTS[data_type])
+    output = await run_agent_cached(data_type, f"{prompt}\n\nData to analyze:\n{data}")
+    sections = split_batch_response(output, len(formatted_items))
+
+    # Searches the model skipped or merged are analyzed on their own
+    missing = [i for i, section in enumerate(sections) if section is None]
+    if missing:
+        logger.warning("Batched %s analysis missed %d of %d searches", data_type, len(missing), len(sections))
+        retried = await asyncio.gather(*(get_ai_recommendation(data_type, formatted_items[i]) for i in missing))
+        for i, recommendation in zip(missing, retried):
+            sections[i] = recommendation
+    return sections
+
+
+@traced("get_batch_ai_recommendations")
+async def get_batch_ai_recommendations(data_type, formatted_items):
+    """
+    Get AI recommendations for several result sets, ``AI_BATCH_SIZE`` per LLM call.
+
+    Args:
+        data_type: 'flights' or 'hotels'
+        formatted_items: Prompt text of each result set
+
+    Returns:
+        One recommendation per result set, in order
+
+    Raises:
+        ValueError: If the data type is not supported
+    """
+    if data_type not in ANALYSIS_PROMPTS:
+        raise ValueError("Invalid data type for AI recommendation")
+
+    chunks = [formatted_items[i:i + AI_BATCH_SIZE] for i in range(0, len(formatted_items), AI_BATCH_SIZE)]
+    logger.info("Getting %s analysis from AI for %d searches in %d calls", data_type, len(formatted_items), len(chunks))
+    results = await asyncio.gather(*(_batch_recommendations(data_type, chunk) for chunk in chunks))
+    return [recommendation for chunk in results for recommendation in chunk]
+
+
+@traced("regenerate_itinerary_section")
+async def regenerate_itinerary_section(destination, flights_text, hotels_text, check_in_date, check_out_date,
+                                       outline, title, section, instructions=""):
+    """
+    Rewrite a single section (usually a day) of an itinerary.
+
+    Only the flight and hotel details, a compact outline of the other sections
+    and the section itself are sent, so the call costs a fraction of a full
+    itinerary generation.
+
+    Args:
+        destination: Trip destination
+        flights_text: Flight details used for the itinerary
+        hotels_text: Hotel details used for the itinerary
+        check_in_date: Trip start (YYYY-MM-DD)
+        check_out_date: Trip end (YYYY-MM-DD)
+        outline: Outline of the whole itinerary (see ``outline_itinerary``)
+        title: Heading text of the section
+        section: Current markdown of the section
+        instructions: Requested changes, if any
+
+    Returns:
+        Markdown of the rewritten section, starting with its heading and
+        ending with the same trailing whitespace as ``section``
+    """
+    days = (datetime.strptime(check_out_date, "%Y-%m-%d") - datetime.strptime(check_in_date, "%Y-%m-%d")).days
+    prompt = SECTION_PROMPT.format(
+        days=days,
+        destination=destination,
+        check_in_date=check_in_date,
+        check_out_date=check_out_date,
+        flights_text=flights_text,
+        hotels_text=hotels_text,
+        outline=outline,
+        section=section.strip(),
+        instructions=instructions.strip() or "Suggest a fresh alternative plan for this section.",
+        title=title
+    )
+    result = await run_agent_cached("itinerary", prompt)
+
+    # Keep only the first section, dropping any preamble or extra sections the
+    # model added; without a heading, reuse the original one. The original
+    # trailing whitespace is kept so the section still joins up with the next
+    _, sections = parse_itinerary(result)
+    rewritten = sections[0]["markdown"] if sections else f"## {title}\n{result.strip()}"
+    return rewritten.rstrip() + section[len(section.rstrip()):]
+
+
+@traced("generate_itinerary")
+async def generate_itinerary(destination, flights_text, hotels_text, check_in_date, check_out_date):
+    """Generate a detailed travel itinerary based on flight and hotel information."""
+    # Convert the string dates to datetime objects
+    check_in = datetime.strptime(check_in_date, "%Y-%m-%d")
+    check_out = datetime.strptime(check_out_date, "%Y-%m-%d")
+
+    # Calculate the difference in days
+    days = (check_out - check_in).days
+
+    prompt = ITINERARY_PROMPT.format(
+        days=days,
+        flights_text=flights_text,
+        hotels_text=hotels_text,
+        destination=destination,
+        check_in_date=check_in_date,
+        check_out_date=check_out_date
+    )
+    return await run_agent_cached("itinerary", prompt)
@@ -0,0 +1,147 @@
+"""
+Batch flight and hotel searches.
+
+Identical requests in a batch (same normalized SerpAPI parameters) are
+searched once. The unique searches run with bounded concurrency through the
+regular search path, so they share the search cache and in-flight coalescing
+with single searches. Each item gets its own result or error, and the
+optional AI analysis puts several result sets into one LLM call.
+"""
+
+import asyncio
+from typing import Callable
+
+from fastapi import HTTPException
+
+from ..models import BatchFlightRequest, BatchHotelRequest, BatchItemResult, BatchResponse
+from ..config import (
+    BATCH_SEARCH_CONCURRENCY, AI_PROMPT_TOKEN_BUDGET, AI_PROMPT_MAX_CANDIDATES,
+    FLIGHT_RANKING_WEIGHTS, HOTEL_RANKING_WEIGHTS, logger
+)
+from ..constants import MAX_BATCH_SIZE, MAX_PAGE_SIZE
+from ..utils.cache import make_cache_key
+from ..utils.prompt_builder import build_flight_prompt, build_hotel_prompt
+from ..utils.records import flight_records_to_models, hotel_records_to_models
+from ..utils.tracing import span, traced
+from .ai_service import get_batch_ai_recommendations
+from .search_service import (
+    search_flight_records, search_hotel_records, build_flight_search_params, build_hotel_search_params
+)
+
+
+def _validate_batch(requests: list, max_results: int) -> None:
+    if not requests:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one request")
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {MAX_BATCH_SIZE} requests")
+    if not 1 <= max_results <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"max_results must be between 1 and {MAX_PAGE_SIZE}")
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return str(error) or type(error).__name__
+
+
+async def _run_batch(data_type: str, requests: list, use_ai: bool, max_results: int,
+                     build_params: Callable, search: Callable, to_models: Callable,
+                     build_prompt: Callable) -> BatchResponse:
+    _validate_batch(requests, max_results)
+
+    # Position of the first occurrence of each distinct search
+    first_index = {}
+    duplicate_of = []
+    for index, request in enumerate(requests):
+        key = make_cache_key(build_params(request))
+        duplicate_of.append(first_index.setdefault(key, index))
+    unique = sorted(set(duplicate_of))
+
+    semaphore = asyncio.Semaphore(BATCH_SEARCH_CONCURRENCY)
+
+    async def run_one(index: int):
+        async with semaphore:
+            return await search(requests[index])
+
+    logger.info("Batch %s search: %d requests, %d unique", data_type, len(requests), len(unique))
+    with span("batch_fan_out", data_type=data_type, requests=len(requests), unique=len(unique)):
+        outcomes = dict(zip(unique, await asyncio.gather(*(run_one(i) for i in unique), return_exceptions=True)))
+
+    recommendations = {}
+    if use_ai:
+        analyzed = [i for i in unique if not isinstance(outcomes[i], BaseException) and outcomes[i]]
+        if analyzed:
+            try:
+                texts = await get_batch_ai_recommendations(data_type, [build_prompt(outcomes[i]) for i in analyzed])
+                recommendations = dict(zip(analyzed, texts))
+            except Exception as e:
+                # The search results are still useful without the analysis
+                logger.warning("Batch %s AI analysis failed: %s", data_type, e)
+                recommendations = {i: f"AI analysis unavailable: {_error_message(e)}" for i in analyzed}
+
+    results = []
+    for index, source in enumerate(duplicate_of):
+        outcome = outcomes[source]
+        duplicate = source if source != index else None
+        if isinstance(outcome, BaseException):
+            results.append(BatchItemResult(index=index, status="failed", error=_error_message(outcome),
+                                           duplicate_of=duplicate))
+            continue
+        results.append(BatchItemResult.model_construct(
+            index=index,
+            status="completed",
+            total_results=len(outcome),
+            ai_recommendation=recommendations.get(source, ""),
+            error="",
+            duplicate_of=duplicate,
+            **{data_type: to_models(outcome[:max_results])}
+        ))
+
+    failed = sum(1 for i in unique if isinstance(outcomes[i], BaseException))
+    return BatchResponse.model_construct(results=results, unique_searches=len(unique), failed=failed)
+
+
+@traced("batch_search_flights")
+async def batch_search_flights(batch: BatchFlightRequest) -> BatchResponse:
+    """
+    Search many routes in one request.
+
+    Args:
+        batch: Flight requests, whether to run the AI analysis, and the most
+            flights returned per request
+
+    Returns:
+        BatchResponse with one result per request, in order
+
+    Raises:
+        HTTPException: 400 if the batch is empty, too large or max_results is out of range
+    """
+    return await _run_batch(
+        "flights", batch.requests, batch.ai, batch.max_results,
+        build_flight_search_params, search_flight_records, flight_records_to_models,
+        lambda records: build_flight_prompt(records, AI_PROMPT_TOKEN_BUDGET, AI_PROMPT_MAX_CANDIDATES,
+                                            FLIGHT_RANKING_WEIGHTS)
+    )
+
+
+@traced("batch_search_hotels")
+async def batch_search_hotels(batch: BatchHotelRequest) -> BatchResponse:
+    """
+    Search hotels in many locations in one request.
+
+    Args:
+        batch: Hotel requests, whether to run the AI analysis, and the most
+            hotels returned per request
+
+    Returns:
+        BatchResponse with one result per request, in order
+
+    Raises:
+        HTTPException: 400 if the batch is empty, too large or max_results is out of range
+    """
+    return await _run_batch(
+        "hotels", batch.requests, batch.ai, batch.max_results,
+        build_hotel_search_params, search_hotel_records, hotel_records_to_models,
+        lambda records: build_hotel_prompt(records, AI_PROMPT_TOKEN_BUDGET, AI_PROMPT_MAX_CANDIDATES,
+                                           HOTEL_RANKING_WEIGHTS)
+    )
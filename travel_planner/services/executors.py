@@ -0,0 +1,160 @@
+"""
+Bounded concurrency for upstream calls.
+
+SerpAPI searches and LLM calls are limited independently so that a slow LLM
+cannot starve searches (and vice versa). Each limiter caps both the number of
+calls running at once and the number of calls waiting for a slot; once the
+queue is full, new calls are rejected with HTTP 503 and a Retry-After header
+instead of piling up.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+
+from ..config import (
+    SEARCH_MAX_WORKERS, SEARCH_MAX_QUEUE, LLM_MAX_WORKERS, LLM_MAX_QUEUE,
+    EXECUTOR_RETRY_AFTER, logger
+)
+from ..utils.metrics import EXECUTOR_WAIT
+
+
+class _BoundedQueue:
+    """Admission control, queue depth and wait-time metrics shared by all limiters."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, retry_after: int = 5):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self.rejected = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of accepted calls still waiting for a slot."""
+        return self._pending - self._active
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def _admit(self) -> float:
+        """Reserve a place in the queue, returning the submission time."""
+        with self._lock:
+            saturated = self._pending >= self.max_workers + self.max_queue
+            if saturated:
+                self.rejected += 1
+            else:
+                self._pending += 1
+
+        if saturated:
+            logger.warning(f"{self.name} executor saturated, rejecting call")
+            raise HTTPException(
+                status_code=503,
+                detail=f"Too many concurrent {self.name} requests, please retry shortly",
+                headers={"Retry-After": str(self.retry_after)}
+            )
+        return time.monotonic()
+
+    def _start(self, submitted_at: float) -> None:
+        EXECUTOR_WAIT.observe(time.monotonic() - submitted_at, executor=self.name)
+        with self._lock:
+            self._active += 1
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def _release(self, *_args) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+class BoundedExecutor(_BoundedQueue):
+    """Thread pool for blocking calls with a bounded wait queue."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, retry_after: int = 5):
+        super().__init__(name, max_workers, max_queue, retry_after)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run a blocking callable in the pool.
+
+        Args:
+            fn: Blocking callable
+            *args, **kwargs: Arguments passed to ``fn``
+
+        Returns:
+            The return value of ``fn``
+
+        Raises:
+            HTTPException: 503 with Retry-After if the pool's queue is full
+        """
+        submitted_at = self._admit()
+
+        def call():
+            self._start(submitted_at)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._finish()
+
+        # Run in a copy of the caller's context so request-scoped state
+        # (trace ids, log sampling) follows the call into the worker thread
+        future = self._pool.submit(contextvars.copy_context().run, call)
+        # Release the slot on completion or cancellation of the pool future
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+class ConcurrencyLimiter(_BoundedQueue):
+    """Limit for native async calls with a bounded wait queue."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, retry_after: int = 5):
+        super().__init__(name, max_workers, max_queue, retry_after)
+        self._semaphore = None
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Await a coroutine function once a slot is free.
+
+        Args:
+            fn: Coroutine function
+            *args, **kwargs: Arguments passed to ``fn``
+
+        Returns:
+            The result of ``fn``
+
+        Raises:
+            HTTPException: 503 with Retry-After if the limiter's queue is full
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        submitted_at = self._admit()
+        try:
+            async with self._semaphore:
+                self._start(submitted_at)
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self._finish()
+        finally:
+            self._release()
+
+
+# Limit for SerpAPI searches (native async HTTP calls)
+search_executor = ConcurrencyLimiter("search", SEARCH_MAX_WORKERS, SEARCH_MAX_QUEUE, EXECUTOR_RETRY_AFTER)
+
+# Pool for blocking LLM (CrewAI) calls
+llm_executor = BoundedExecutor("llm", LLM_MAX_WORKERS, LLM_MAX_QUEUE, EXECUTOR_RETRY_AFTER)
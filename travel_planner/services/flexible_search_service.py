@@ -0,0 +1,115 @@
+"""
+Flexible-date flight search.
+
+Searches every outbound/return date pair within +/- N days of the requested
+dates and condenses the results into a price calendar: the cheapest fare per
+date pair plus the cheapest flights overall. Each date pair goes through the
+regular flight search, so pairs already searched are served from the search
+cache and identical concurrent pairs share one SerpAPI call.
+"""
+
+import asyncio
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from ..models import FlexibleFlightRequest, FlightRequest, DateOption, PriceCalendar
+from ..config import FLEX_SEARCH_CONCURRENCY, logger
+from ..constants import MAX_FLEX_DAYS, FLEX_BEST_OPTIONS
+from ..utils.dates import parse_date
+from ..utils.records import FlightRecord, flight_records_to_models
+from ..utils.tracing import span, traced
+from .search_service import search_flight_records
+
+
+def _date_window(center: date, flex_days: int) -> List[date]:
+    return [center + timedelta(days=offset) for offset in range(-flex_days, flex_days + 1)]
+
+
+def _cheapest(records: List[FlightRecord]) -> Optional[FlightRecord]:
+    priced = [record for record in records if record.price]
+    return min(priced, key=lambda record: record.price) if priced else None
+
+
+@traced("flexible_flight_search")
+async def search_flexible_dates(flex_request: FlexibleFlightRequest) -> PriceCalendar:
+    """
+    Build a price calendar around the requested travel dates.
+
+    Date pairs whose return is before the outbound date, or whose outbound
+    date is in the past, are not searched. At most ``FLEX_SEARCH_CONCURRENCY``
+    searches of one request run at once.
+
+    Args:
+        flex_request: Route, center dates and the +/- day window
+
+    Returns:
+        PriceCalendar with the cheapest fare per date pair and the best options
+
+    Raises:
+        HTTPException: 400 for invalid dates or window, or the search error if
+            every date pair failed
+    """
+    if not 0 <= flex_request.flex_days <= MAX_FLEX_DAYS:
+        raise HTTPException(status_code=400, detail=f"flex_days must be between 0 and {MAX_FLEX_DAYS}")
+
+    outbound_dates = _date_window(parse_date(flex_request.outbound_date, "outbound_date"), flex_request.flex_days)
+    return_dates = _date_window(parse_date(flex_request.return_date, "return_date"), flex_request.flex_days)
+    today = date.today()
+    pairs = [
+        (outbound, inbound)
+        for outbound in outbound_dates if outbound >= today
+        for inbound in return_dates if inbound >= outbound
+    ]
+    if not pairs:
+        raise HTTPException(status_code=400, detail="No valid outbound/return date pairs in the requested window")
+
+    semaphore = asyncio.Semaphore(FLEX_SEARCH_CONCURRENCY)
+
+    async def search_pair(outbound: date, inbound: date) -> List[FlightRecord]:
+        async with semaphore:
+            return await search_flight_records(FlightRequest(
+                origin=flex_request.origin,
+                destination=flex_request.destination,
+                outbound_date=outbound.isoformat(),
+                return_date=inbound.isoformat()
+            ))
+
+    logger.info("Flexible search %s to %s over %d date pairs",
+                flex_request.origin, flex_request.destination, len(pairs))
+    with span("flexible_fan_out", pairs=len(pairs), concurrency=FLEX_SEARCH_CONCURRENCY):
+        results = await asyncio.gather(*(search_pair(*pair) for pair in pairs), return_exceptions=True)
+
+    cheapest: Dict[Tuple[date, date], FlightRecord] = {}
+    errors = []
+    for pair, result in zip(pairs, results):
+        if isinstance(result, BaseException):
+            logger.warning("Flexible search failed for %s/%s: %s", pair[0], pair[1], result)
+            errors.append(result)
+            continue
+        best = _cheapest(result)
+        if best is not None:
+            cheapest[pair] = best
+
+    if len(errors) == len(pairs):
+        raise errors[0]
+
+    best_pairs = sorted(cheapest.items(), key=lambda item: item[1].price)[:FLEX_BEST_OPTIONS]
+    best_flights = flight_records_to_models([record for _, record in best_pairs])
+
+    return PriceCalendar(
+        outbound_dates=[day.isoformat() for day in outbound_dates],
+        return_dates=[day.isoformat() for day in return_dates],
+        prices=[
+            [cheapest[(outbound, inbound)].price if (outbound, inbound) in cheapest else None
+             for inbound in return_dates]
+            for outbound in outbound_dates
+        ],
+        best_options=[
+            DateOption(outbound_date=outbound.isoformat(), return_date=inbound.isoformat(), flight=flight)
+            for ((outbound, inbound), _), flight in zip(best_pairs, best_flights)
+        ],
+        searches=len(pairs),
+        failed_searches=len(errors)
+    )
@@ -0,0 +1,329 @@
+"""
+SQLite-backed job queue for itinerary generation.
+
+Itinerary requests are stored in a local SQLite database and processed by a
+pool of worker processes, keeping LLM latency out of the API event loop. No
+external broker is needed; the API and the workers only share the database
+file. Workers can run inside the API process group (``ITINERARY_WORKERS``) or
+standalone:
+
+    python -m travel_planner.services.itinerary_queue --workers 4
+
+A running job is leased to its worker, which renews the lease with periodic
+heartbeats. If the worker dies or is terminated mid-job, the job is requeued
+once the lease expires (or immediately when the pool stops that worker), and
+failed after ``ITINERARY_JOB_MAX_ATTEMPTS`` claims.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+from ..config import (
+    ITINERARY_QUEUE_PATH, ITINERARY_WORKERS, ITINERARY_POLL_INTERVAL, ITINERARY_JOB_LEASE,
+    ITINERARY_JOB_MAX_ATTEMPTS, logger
+)
+
+JOB_STATUSES = ("queued", "running", "completed", "failed", "cancelled")
+
+# Columns added after the first release, created on existing databases too
+_ADDED_COLUMNS = (("heartbeat_at", "REAL"), ("attempts", "INTEGER NOT NULL DEFAULT 0"), ("itinerary_id", "TEXT"))
+
+LOST_JOB_ERROR = "Itinerary worker stopped before finishing the job"
+
+
+def worker_name(pid: int) -> str:
+    """Identifier recorded on the jobs claimed by the worker process ``pid``."""
+    return f"{os.uname().nodename}:{pid}"
+
+
+class ItineraryQueue:
+    """Persistent queue of itinerary jobs shared between the API and workers."""
+
+    def __init__(self, path: str = ITINERARY_QUEUE_PATH, lease: float = ITINERARY_JOB_LEASE,
+                 max_attempts: int = ITINERARY_JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS itinerary_jobs ("
+                " id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " result TEXT,"
+                " error TEXT,"
+                " worker TEXT,"
+                " created_at REAL NOT NULL,"
+                " started_at REAL,"
+                " finished_at REAL)"
+            )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(itinerary_jobs)")}
+            for column, definition in _ADDED_COLUMNS:
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE itinerary_jobs ADD COLUMN {column} {definition}")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS itinerary_jobs_queued ON itinerary_jobs (status, created_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Short-lived autocommit connections, safe to use from any process
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, payload: dict) -> str:
+        """
+        Queue an itinerary request.
+
+        Args:
+            payload: Keyword arguments for ``generate_itinerary``
+
+        Returns:
+            The new job id
+        """
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO itinerary_jobs (id, status, payload, created_at) VALUES (?, 'queued', ?, ?)",
+                (job_id, json.dumps(payload), time.time())
+            )
+        logger.info(f"Queued itinerary job {job_id}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return the job record, or None if the id is unknown."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM itinerary_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        A running job's worker finishes its current LLM call but its result is
+        discarded.
+
+        Returns:
+            True if the job was cancelled, False if it had already finished
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE itinerary_jobs SET status = 'cancelled', finished_at = ?"
+                " WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id)
+            )
+        return cursor.rowcount > 0
+
+    def claim_next(self, worker: str) -> Optional[dict]:
+        """
+        Atomically move the oldest queued job to 'running' and return it.
+
+        Running jobs whose lease expired are reclaimed first, so a job lost
+        with its worker is picked up again (or failed) by the next claim.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                started_at = time.time()
+                self._reclaim(conn, "COALESCE(heartbeat_at, started_at) < ?", (started_at - self.lease,))
+                row = conn.execute(
+                    "SELECT * FROM itinerary_jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE itinerary_jobs SET status = 'running', worker = ?, started_at = ?, heartbeat_at = ?,"
+                    " attempts = attempts + 1 WHERE id = ?",
+                    (worker, started_at, started_at, row["id"])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        job = dict(row)
+        job.update(status="running", worker=worker, started_at=started_at, heartbeat_at=started_at,
+                   attempts=row["attempts"] + 1)
+        return job
+
+    def heartbeat(self, job_id: str) -> None:
+        """Renew the lease of a running job."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE itinerary_jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                (time.time(), job_id)
+            )
+
+    def release_worker(self, worker: str) -> int:
+        """
+        Reclaim the running jobs of a worker that was stopped, without waiting for their lease.
+
+        Returns:
+            Number of jobs requeued or failed
+        """
+        with self._connect() as conn:
+            return self._reclaim(conn, "worker = ?", (worker,))
+
+    def _reclaim(self, conn, condition: str, args: tuple) -> int:
+        """Requeue the running jobs matching ``condition``, failing those out of attempts."""
+        failed = conn.execute(
+            "UPDATE itinerary_jobs SET status = 'failed', error = ?, finished_at = ?"
+            f" WHERE status = 'running' AND attempts >= ? AND {condition}",
+            (LOST_JOB_ERROR, time.time(), self.max_attempts, *args)
+        ).rowcount
+        requeued = conn.execute(
+            "UPDATE itinerary_jobs SET status = 'queued', worker = NULL, started_at = NULL, heartbeat_at = NULL"
+            f" WHERE status = 'running' AND {condition}",
+            args
+        ).rowcount
+        if failed or requeued:
+            logger.warning(f"Reclaimed lost itinerary jobs: {requeued} requeued, {failed} failed")
+        return failed + requeued
+
+    def complete(self, job_id: str, result: str) -> None:
+        self._finish(job_id, "completed", result=result)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._finish(job_id, "failed", error=error)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        # Only running jobs are finished, so results of cancelled jobs are dropped
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE itinerary_jobs SET status = ?, result = ?, error = ?, finished_at = ?"
+                " WHERE id = ? AND status = 'running'",
+                (status, result, error, time.time(), job_id)
+            )
+
+    def set_itinerary_id(self, job_id: str, itinerary_id: str) -> None:
+        """Record the id a completed job's itinerary is stored under, unless one is already set."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE itinerary_jobs SET itinerary_id = ? WHERE id = ? AND itinerary_id IS NULL",
+                (itinerary_id, job_id)
+            )
+
+    def counts(self) -> dict:
+        """Number of jobs per status."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM itinerary_jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        counts.update({status: count for status, count in rows})
+        return counts
+
+
+@contextmanager
+def _heartbeat(queue: ItineraryQueue, job_id: str):
+    """Renew the job's lease from a background thread while the block runs."""
+    done = threading.Event()
+
+    def beat():
+        while not done.wait(queue.lease / 3):
+            queue.heartbeat(job_id)
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def run_worker(path: str, poll_interval: float, stop_event) -> None:
+    """Worker process loop: claim queued jobs and generate their itineraries."""
+    # Imported here so the API process does not need the AI stack to enqueue jobs
+    from .ai_service import generate_itinerary
+
+    queue = ItineraryQueue(path)
+    worker = worker_name(os.getpid())
+    logger.info(f"Itinerary worker {worker} started")
+
+    while not stop_event.is_set():
+        job = queue.claim_next(worker)
+        if job is None:
+            stop_event.wait(poll_interval)
+            continue
+
+        logger.info(f"Worker {worker} generating itinerary for job {job['id']}")
+        try:
+            with _heartbeat(queue, job["id"]):
+                itinerary = asyncio.run(generate_itinerary(**json.loads(job["payload"])))
+        except Exception as e:
+            logger.exception(f"Itinerary job {job['id']} failed: {str(e)}")
+            queue.fail(job["id"], str(e))
+        else:
+            queue.complete(job["id"], itinerary)
+
+
+class ItineraryWorkerPool:
+    """Pool of worker processes consuming the itinerary queue."""
+
+    def __init__(self, path: str = ITINERARY_QUEUE_PATH, workers: int = ITINERARY_WORKERS,
+                 poll_interval: float = ITINERARY_POLL_INTERVAL):
+        self.path = path
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._processes = []
+
+    def start(self) -> None:
+        for _ in range(self.workers):
+            process = self._context.Process(
+                target=run_worker,
+                args=(self.path, self.poll_interval, self._stop_event),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+        logger.info(f"Started {self.workers} itinerary worker processes")
+
+    def join(self) -> None:
+        for process in self._processes:
+            process.join()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+                # Requeue its job now rather than when the lease expires
+                ItineraryQueue(self.path).release_worker(worker_name(process.pid))
+        self._processes = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run itinerary queue workers.")
+    parser.add_argument("--workers", type=int, default=max(ITINERARY_WORKERS, 1))
+    parser.add_argument("--path", default=ITINERARY_QUEUE_PATH)
+    args = parser.parse_args()
+
+    ItineraryQueue(args.path)
+    pool = ItineraryWorkerPool(args.path, args.workers)
+    pool.start()
+    try:
+        pool.join()
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
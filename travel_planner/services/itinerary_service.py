@@ -0,0 +1,117 @@
+"""
+Stored, per-section itineraries with single-section regeneration.
+
+A generated itinerary is parsed into its sections (one per day, plus any
+general sections such as tips) and stored together with the inputs it was
+generated from. Changing one day then rewrites only that section, with a
+compact outline of the others for context, instead of regenerating the whole
+document.
+"""
+
+from fastapi import HTTPException
+
+from ..models import ItinerarySection, StructuredItinerary
+from ..config import logger
+from ..utils.itinerary import parse_itinerary, render_itinerary, outline_itinerary
+from ..utils.tracing import traced
+from .ai_service import regenerate_itinerary_section
+from .result_store import save_itinerary, load_itinerary
+
+
+def _to_model(itinerary_id: str, entry: dict) -> StructuredItinerary:
+    return StructuredItinerary(
+        itinerary_id=itinerary_id,
+        destination=entry["destination"],
+        check_in_date=entry["check_in_date"],
+        check_out_date=entry["check_out_date"],
+        preamble=entry["preamble"],
+        sections=[ItinerarySection(index=index, **section) for index, section in enumerate(entry["sections"])],
+        itinerary=render_itinerary(entry["preamble"], entry["sections"])
+    )
+
+
+def store_itinerary(destination: str, flights_text: str, hotels_text: str,
+                    check_in_date: str, check_out_date: str, itinerary: str) -> str:
+    """
+    Parse a generated itinerary into sections and store it with its inputs.
+
+    Returns:
+        The itinerary_id
+    """
+    preamble, sections = parse_itinerary(itinerary)
+    return save_itinerary({
+        "destination": destination,
+        "flights_text": flights_text,
+        "hotels_text": hotels_text,
+        "check_in_date": check_in_date,
+        "check_out_date": check_out_date,
+        "preamble": preamble,
+        "sections": sections
+    })
+
+
+def get_itinerary_sections(itinerary_id: str) -> StructuredItinerary:
+    """
+    Load a stored itinerary.
+
+    Raises:
+        HTTPException: 404 if the itinerary is unknown or expired
+    """
+    return _to_model(itinerary_id, load_itinerary(itinerary_id))
+
+
+def find_day_section(itinerary_id: str, day: int) -> int:
+    """
+    Index of the section for ``day`` of a stored itinerary.
+
+    Raises:
+        HTTPException: 404 if the itinerary or the day is not found
+    """
+    for index, section in enumerate(load_itinerary(itinerary_id)["sections"]):
+        if section["day"] == day:
+            return index
+    raise HTTPException(status_code=404, detail=f"Itinerary has no section for day {day}")
+
+
+@traced("regenerate_section")
+async def regenerate_section(itinerary_id: str, index: int, instructions: str = "") -> StructuredItinerary:
+    """
+    Rewrite one section of a stored itinerary and store the result.
+
+    Args:
+        itinerary_id: Stored itinerary
+        index: Position of the section to rewrite
+        instructions: Requested changes, if any
+
+    Returns:
+        The updated itinerary
+
+    Raises:
+        HTTPException: 404 if the itinerary or section is not found
+    """
+    entry = load_itinerary(itinerary_id)
+    sections = entry["sections"]
+    if not 0 <= index < len(sections):
+        raise HTTPException(status_code=404, detail=f"Itinerary has no section {index} ({len(sections)} sections)")
+
+    section = sections[index]
+    logger.info("Regenerating itinerary section %d (%s)", index, section["title"])
+    markdown = await regenerate_itinerary_section(
+        entry["destination"],
+        entry["flights_text"],
+        entry["hotels_text"],
+        entry["check_in_date"],
+        entry["check_out_date"],
+        outline_itinerary(sections, index),
+        section["title"],
+        section["markdown"],
+        instructions
+    )
+    _, (rewritten, *_) = parse_itinerary(markdown)
+
+    # Re-read so a concurrent edit of another section is not lost
+    latest = load_itinerary(itinerary_id)
+    if index < len(latest["sections"]):
+        latest["sections"][index] = rewritten
+    save_itinerary(latest, itinerary_id)
+    return _to_model(itinerary_id, latest)
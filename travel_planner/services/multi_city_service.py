@@ -0,0 +1,145 @@
+"""
+Multi-city trip planning.
+
+A trip is an origin plus an ordered list of cities with stay dates. Every
+flight leg is searched one-way and every city's hotels are searched
+concurrently, through the regular cached search path. The best options of all
+legs and stays are condensed into one compact summary for a single itinerary
+LLM call.
+"""
+
+import asyncio
+from typing import List, Tuple
+
+from fastapi import HTTPException
+
+from ..models import (
+    MultiCityTripRequest, FlightRequest, HotelRequest, FlightLeg, CityStay, MultiCityTripResponse
+)
+from ..config import (
+    BATCH_SEARCH_CONCURRENCY, AI_PROMPT_TOKEN_BUDGET, FLIGHT_RANKING_WEIGHTS, HOTEL_RANKING_WEIGHTS, logger
+)
+from ..constants import MAX_TRIP_CITIES, MULTI_CITY_MAX_CANDIDATES
+from ..utils.dates import parse_date
+from ..utils.location_utils import convert_airport_code_to_city
+from ..utils.prompt_builder import build_flight_prompt, build_hotel_prompt
+from ..utils.records import flight_records_to_models, hotel_records_to_models
+from ..utils.tracing import span, traced
+from .ai_service import generate_itinerary
+from .itinerary_service import store_itinerary
+from .search_service import search_flight_records, search_hotel_records
+
+
+def plan_legs(trip: MultiCityTripRequest) -> List[Tuple[str, str, str]]:
+    """
+    Derive the flight legs of a multi-city trip.
+
+    The first leg leaves the origin on the first check-in date, each further
+    leg leaves a city on its check-out date, and the optional last leg returns
+    to the origin.
+
+    Args:
+        trip: Origin and ordered stops
+
+    Returns:
+        (origin, destination, date) per leg, in travel order
+
+    Raises:
+        HTTPException: 400 if there are no or too many stops, or the dates
+            are invalid or out of order
+    """
+    if not trip.stops:
+        raise HTTPException(status_code=400, detail="A multi-city trip needs at least one stop")
+    if len(trip.stops) > MAX_TRIP_CITIES:
+        raise HTTPException(status_code=400, detail=f"A multi-city trip is limited to {MAX_TRIP_CITIES} stops")
+
+    previous_check_out = None
+    for stop in trip.stops:
+        check_in = parse_date(stop.check_in_date, "check_in_date")
+        check_out = parse_date(stop.check_out_date, "check_out_date")
+        if check_out <= check_in:
+            raise HTTPException(status_code=400, detail=f"Stay in {stop.city} must end after it starts")
+        if previous_check_out and check_in < previous_check_out:
+            raise HTTPException(status_code=400, detail=f"Stay in {stop.city} starts before the previous stay ends")
+        previous_check_out = check_out
+
+    legs = [(trip.origin, trip.stops[0].city, trip.stops[0].check_in_date)]
+    for current, following in zip(trip.stops, trip.stops[1:]):
+        legs.append((current.city, following.city, current.check_out_date))
+    if trip.return_to_origin:
+        legs.append((trip.stops[-1].city, trip.origin, trip.stops[-1].check_out_date))
+    return legs
+
+
+@traced("plan_multi_city_trip")
+async def plan_multi_city_trip(trip: MultiCityTripRequest) -> MultiCityTripResponse:
+    """
+    Search all legs and stays of a multi-city trip and build one itinerary.
+
+    At most ``BATCH_SEARCH_CONCURRENCY`` searches of the trip run at once.
+
+    Args:
+        trip: Origin, ordered stops and whether to fly back to the origin
+
+    Returns:
+        MultiCityTripResponse with the flights of each leg, the hotels of each
+        city and the itinerary
+
+    Raises:
+        HTTPException: 400 for an invalid trip, or the error of a failed search
+    """
+    legs = plan_legs(trip)
+    semaphore = asyncio.Semaphore(BATCH_SEARCH_CONCURRENCY)
+
+    async def bounded(search, request):
+        async with semaphore:
+            return await search(request)
+
+    flight_searches = [
+        bounded(search_flight_records, FlightRequest(origin=origin, destination=destination, outbound_date=day))
+        for origin, destination, day in legs
+    ]
+    hotel_searches = [
+        bounded(search_hotel_records, HotelRequest(
+            location=stop.city, check_in_date=stop.check_in_date, check_out_date=stop.check_out_date
+        ))
+        for stop in trip.stops
+    ]
+
+    logger.info("Multi-city trip from %s: %d legs, %d cities", trip.origin, len(legs), len(trip.stops))
+    with span("multi_city_fan_out", legs=len(legs), cities=len(trip.stops)):
+        results = await asyncio.gather(*flight_searches, *hotel_searches)
+    flight_results, hotel_results = results[:len(legs)], results[len(legs):]
+
+    # Split the usual prompt budget across the legs and cities
+    section_budget = max(AI_PROMPT_TOKEN_BUDGET // (len(legs) + len(trip.stops)), 100)
+    flights_text = "\n\n".join(
+        f"Leg {i}: {origin} to {destination} on {day}\n"
+        + build_flight_prompt(records, section_budget, MULTI_CITY_MAX_CANDIDATES, FLIGHT_RANKING_WEIGHTS)
+        for i, ((origin, destination, day), records) in enumerate(zip(legs, flight_results), 1)
+    )
+    hotels_text = "\n\n".join(
+        f"{convert_airport_code_to_city(stop.city)}, {stop.check_in_date} to {stop.check_out_date}\n"
+        + build_hotel_prompt(records, section_budget, MULTI_CITY_MAX_CANDIDATES, HOTEL_RANKING_WEIGHTS)
+        for stop, records in zip(trip.stops, hotel_results)
+    )
+
+    destination = " -> ".join(convert_airport_code_to_city(stop.city) for stop in trip.stops)
+    check_in_date, check_out_date = trip.stops[0].check_in_date, trip.stops[-1].check_out_date
+    itinerary = await generate_itinerary(destination, flights_text, hotels_text, check_in_date, check_out_date)
+    itinerary_id = store_itinerary(destination, flights_text, hotels_text, check_in_date, check_out_date, itinerary)
+
+    return MultiCityTripResponse.model_construct(
+        legs=[
+            FlightLeg.model_construct(origin=origin, destination=destination, date=day,
+                                      flights=flight_records_to_models(records))
+            for (origin, destination, day), records in zip(legs, flight_results)
+        ],
+        stays=[
+            CityStay.model_construct(city=stop.city, check_in_date=stop.check_in_date,
+                                     check_out_date=stop.check_out_date, hotels=hotel_records_to_models(records))
+            for stop, records in zip(trip.stops, hotel_results)
+        ],
+        itinerary=itinerary,
+        itinerary_id=itinerary_id
+    )
@@ -0,0 +1,109 @@
+"""
+In-process table of background AI recommendation jobs.
+
+Search endpoints can return results immediately and hand the AI analysis to
+this table; clients then fetch the recommendation by id once it is ready.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Dict, Optional
+from fastapi import HTTPException
+
+from ..config import RECOMMENDATION_JOB_TTL, logger
+
+
+class RecommendationJob:
+    """A background AI recommendation and its outcome."""
+
+    def __init__(self, job_id: str, data_type: str, task: asyncio.Task):
+        self.job_id = job_id
+        self.data_type = data_type
+        self.task = task
+        self.created_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        task.add_done_callback(self._mark_finished)
+
+    def _mark_finished(self, _task) -> None:
+        self.finished_at = time.monotonic()
+
+    @property
+    def status(self) -> str:
+        if not self.task.done():
+            return "pending"
+        if self.task.cancelled() or self.task.exception() is not None:
+            return "failed"
+        return "completed"
+
+    @property
+    def recommendation(self) -> str:
+        return self.task.result() if self.status == "completed" else ""
+
+    @property
+    def error(self) -> str:
+        if self.status != "failed":
+            return ""
+        if self.task.cancelled():
+            return "Recommendation was cancelled"
+        exc = self.task.exception()
+        return exc.detail if isinstance(exc, HTTPException) else str(exc)
+
+
+class RecommendationJobs:
+    """
+    Job table with expiry.
+
+    Jobs are kept until ``ttl`` seconds after they finish (or after they were
+    created, for jobs still running past twice the TTL) and purged lazily.
+    """
+
+    def __init__(self, ttl: float = RECOMMENDATION_JOB_TTL):
+        self.ttl = ttl
+        self._jobs: Dict[str, RecommendationJob] = {}
+
+    def submit(self, data_type: str, recommendation: Awaitable[str]) -> str:
+        """
+        Start an AI recommendation in the background.
+
+        Args:
+            data_type: 'flights' or 'hotels'
+            recommendation: Awaitable producing the recommendation text
+
+        Returns:
+            Job id to poll with ``get`` or ``wait``
+        """
+        self.purge_expired()
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = RecommendationJob(job_id, data_type, asyncio.ensure_future(recommendation))
+        logger.info(f"Submitted {data_type} recommendation job {job_id}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[RecommendationJob]:
+        self.purge_expired()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[RecommendationJob]:
+        """Return the job once it finishes or ``timeout`` seconds pass, whichever comes first."""
+        job = self.get(job_id)
+        if job is not None and timeout > 0 and not job.task.done():
+            await asyncio.wait({job.task}, timeout=timeout)
+        return job
+
+    def purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if (job.finished_at is not None and now - job.finished_at > self.ttl)
+            or now - job.created_at > 2 * self.ttl
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if not job.task.done():
+                job.task.cancel()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+recommendation_jobs = RecommendationJobs()
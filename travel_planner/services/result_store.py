@@ -0,0 +1,128 @@
+"""
+Server-side store of search results and itineraries.
+
+Every flight or hotel search stores its normalized records under a
+``result_id``, so later calls (paging, re-ranking, AI analysis, itineraries)
+can reference the results instead of searching again or uploading them. The
+id is derived from the search parameters and the records themselves, so a
+repeated search with changed results gets a new id and the indices of
+options in the old one stay valid until it expires. Generated itineraries
+are stored section by section under a random ``itinerary_id`` so single days
+can be regenerated. They are kept in a cache of their own, so bursts of
+searches cannot evict them. Entries live in memory LRU caches, or in SQLite
+when ``RESULT_STORE_BACKEND``/``ITINERARY_STORE_BACKEND`` is ``sqlite`` so
+they survive restarts and are shared between processes.
+"""
+
+import uuid
+from typing import List, Optional
+
+from fastapi import HTTPException
+
+from ..models import FlightRequest, HotelRequest
+from ..config import (
+    RESULT_STORE_BACKEND, RESULT_STORE_MAX_SIZE, RESULT_STORE_TTL, RESULT_STORE_PATH,
+    ITINERARY_STORE_BACKEND, ITINERARY_STORE_MAX_SIZE, ITINERARY_STORE_TTL, ITINERARY_STORE_PATH
+)
+from ..utils.cache import create_cache, make_cache_key
+from ..utils.records import FlightRecord, HotelRecord
+from .search_service import build_flight_search_params, build_hotel_search_params
+
+
+result_store = create_cache(
+    RESULT_STORE_BACKEND,
+    max_size=RESULT_STORE_MAX_SIZE,
+    default_ttl=RESULT_STORE_TTL,
+    path=RESULT_STORE_PATH
+)
+
+itinerary_store = create_cache(
+    ITINERARY_STORE_BACKEND,
+    max_size=ITINERARY_STORE_MAX_SIZE,
+    default_ttl=ITINERARY_STORE_TTL,
+    path=ITINERARY_STORE_PATH
+)
+
+
+def _save(data_type: str, params: dict, request: dict, records: list) -> str:
+    # Records are stored as plain lists so the SQLite backend can serialize them
+    stored = [list(record) for record in records]
+    result_id = make_cache_key({"data_type": data_type, **params, "records": stored})[:32]
+    result_store.set(result_id, {"data_type": data_type, "request": request, "records": stored})
+    return result_id
+
+
+def _load(result_id: str, data_type: str, store=None) -> dict:
+    entry = (store or result_store).get(result_id)
+    if entry is None or entry["data_type"] != data_type:
+        raise HTTPException(status_code=404, detail=f"No stored {data_type} for id {result_id!r}")
+    return entry
+
+
+def save_flight_results(flight_request: FlightRequest, records: List[FlightRecord]) -> str:
+    """
+    Store the records of a flight search.
+
+    Returns:
+        The result_id to reference them by
+    """
+    return _save("flights", build_flight_search_params(flight_request), flight_request.model_dump(), records)
+
+
+def save_hotel_results(hotel_request: HotelRequest, records: List[HotelRecord]) -> str:
+    """
+    Store the records of a hotel search.
+
+    Returns:
+        The result_id to reference them by
+    """
+    return _save("hotels", build_hotel_search_params(hotel_request), hotel_request.model_dump(), records)
+
+
+def load_flight_results(result_id: str) -> List[FlightRecord]:
+    """
+    Load stored flight records.
+
+    Raises:
+        HTTPException: 404 if the id is unknown, expired or not a flight search
+    """
+    return [
+        FlightRecord(*values[:4], tuple(values[4]), *values[5:])
+        for values in _load(result_id, "flights")["records"]
+    ]
+
+
+def load_hotel_results(result_id: str) -> List[HotelRecord]:
+    """
+    Load stored hotel records.
+
+    Raises:
+        HTTPException: 404 if the id is unknown, expired or not a hotel search
+    """
+    return [HotelRecord(*values) for values in _load(result_id, "hotels")["records"]]
+
+
+def save_itinerary(itinerary: dict, itinerary_id: Optional[str] = None) -> str:
+    """
+    Store a structured itinerary, replacing the entry of ``itinerary_id`` if given.
+
+    Args:
+        itinerary: JSON-serializable itinerary (inputs, preamble and sections)
+        itinerary_id: Id of the itinerary to replace; a new id is created if omitted
+
+    Returns:
+        The itinerary_id
+    """
+    itinerary_id = itinerary_id or uuid.uuid4().hex
+    itinerary_store.set(itinerary_id, {**itinerary, "data_type": "itinerary"})
+    return itinerary_id
+
+
+def load_itinerary(itinerary_id: str) -> dict:
+    """
+    Load a stored itinerary.
+
+    Raises:
+        HTTPException: 404 if the id is unknown or expired
+    """
+    return _load(itinerary_id, "itinerary", itinerary_store)
@@ -2,19 +2,54 @@
 Search service for handling flight and hotel searches using SerpAPI.
 """
 
-import asyncio
+from typing import List
+
 from fastapi import HTTPException
-from serpapi import GoogleSearch
 
 from ..models import FlightRequest, HotelRequest
-from ..config import SERP_API_KEY, logger
-from ..constants import DEFAULT_FLIGHT_PARAMS, DEFAULT_HOTEL_PARAMS, SEARCH_ENGINES
+from ..config import SERP_API_KEY, SEARCH_CACHE_BACKEND, SEARCH_CACHE_MAX_SIZE, SEARCH_CACHE_PATH, logger, log_payload
+from ..constants import (
+    DEFAULT_FLIGHT_PARAMS, DEFAULT_HOTEL_PARAMS, SEARCH_ENGINES, FLIGHT_TRIP_TYPES,
+    SEARCH_CACHE_TTLS, DEFAULT_SEARCH_CACHE_TTL
+)
+from ..utils.cache import create_cache, make_cache_key
+from ..utils.records import FlightRecord, HotelRecord, normalize_flights, normalize_hotels
+from ..utils.singleflight import SingleFlight
+from ..utils.metrics import UPSTREAM_ERRORS, timed_stage
+from ..utils.tracing import span, traced
+from .executors import search_executor
+from .serpapi_client import get_serpapi_client
 from ..utils.location_utils import convert_airport_code_to_city, get_country_code_for_location, get_location_info
 
 
+# Shared cache of SerpAPI responses keyed on normalized search params
+search_cache = create_cache(
+    SEARCH_CACHE_BACKEND,
+    max_size=SEARCH_CACHE_MAX_SIZE,
+    default_ttl=DEFAULT_SEARCH_CACHE_TTL,
+    path=SEARCH_CACHE_PATH
+)
+
+# Normalized records of recent searches, so filtering, sorting and paging
+# through the same search skip both SerpAPI and re-parsing. Records are Python
+# objects, so they stay in process memory whatever the search cache backend.
+records_cache = create_cache(
+    "none" if SEARCH_CACHE_BACKEND.strip().lower() == "none" else "memory",
+    max_size=SEARCH_CACHE_MAX_SIZE,
+    default_ttl=DEFAULT_SEARCH_CACHE_TTL
+)
+
+# Coalesces concurrent identical searches into a single upstream call
+search_singleflight = SingleFlight()
+
+
 async def run_search(params: dict) -> dict:
     """
     Generic function to run SerpAPI searches asynchronously.
+
+    Results are served from ``search_cache`` when an identical search (ignoring
+    the API key) was made within the engine's TTL, and concurrent identical
+    searches share a single SerpAPI call.
     
     Args:
         params: Dictionary of search parameters for SerpAPI
@@ -25,13 +60,40 @@ async def run_search(params: dict) -> dict:
     Raises:
         HTTPException: If the search API call fails
     """
+    cache_key = make_cache_key(params)
+    with span("run_search", engine=params.get("engine"), params_fingerprint=cache_key) as search_span:
+        cached_results = search_cache.get(cache_key)
+        if search_span is not None:
+            search_span.set("cache_hit", cached_results is not None)
+        if cached_results is not None:
+            logger.info("SerpAPI cache hit for %s search", params.get("engine"))
+            return cached_results
+
+        return await search_singleflight.do(cache_key, lambda: _fetch_search_results(params, cache_key))
+
+
+@timed_stage("serpapi_search")
+@traced("serpapi_search")
+async def _fetch_search_results(params: dict, cache_key: str) -> dict:
+    """Call SerpAPI and store successful responses in the search cache."""
     try:
-        return await asyncio.to_thread(lambda: GoogleSearch(params).get_dict())
+        search_results = await search_executor.run(get_serpapi_client().search, params)
+    except HTTPException:
+        raise
     except Exception as e:
+        UPSTREAM_ERRORS.inc(service="serpapi")
         logger.exception(f"SerpAPI search error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Search API error: {str(e)}")
 
+    # Only cache successful responses so transient upstream errors are retried
+    if search_results and "error" not in search_results:
+        ttl = SEARCH_CACHE_TTLS.get(params.get("engine"), DEFAULT_SEARCH_CACHE_TTL)
+        search_cache.set(cache_key, search_results, ttl=ttl)
+
+    return search_results
 
+
+@traced("search_flights")
 async def search_flights(flight_request: FlightRequest) -> list:
     """
     Fetch real-time flight details from Google Flights using SerpAPI.
@@ -42,25 +104,15 @@ async def search_flights(flight_request: FlightRequest) -> list:
     Returns:
         List of flight data from SerpAPI
     """
-    logger.info(f"Searching flights: {flight_request.origin} to {flight_request.destination}")
+    logger.info("Searching flights: %s to %s", flight_request.origin, flight_request.destination)
 
-    # Build search parameters
-    params = {
-        "api_key": SERP_API_KEY,
-        "engine": SEARCH_ENGINES["flights"],
-        "departure_id": flight_request.origin.strip().upper(),
-        "arrival_id": flight_request.destination.strip().upper(),
-        "outbound_date": flight_request.outbound_date,
-        "return_date": flight_request.return_date,
-        **DEFAULT_FLIGHT_PARAMS
-    }
+    params = build_flight_search_params(flight_request)
 
     search_results = await run_search(params)
-    logger.info(f"SerpAPI response keys: {list(search_results.keys()) if search_results else 'None'}")
     
-    # Log the full response for debugging
+    # Log the raw response for debugging (sampled, truncated, DEBUG level only)
     if search_results:
-        logger.info(f"Full SerpAPI response: {search_results}")
+        log_payload("SerpAPI flight response", search_results)
     
     # Extract flights from SerpAPI response structure
     flights = []
@@ -73,14 +125,14 @@ async def search_flights(flight_request: FlightRequest) -> list:
         flights = best_flights + other_flights
         
         if flights:
-            logger.info(f"Found {len(best_flights)} best flights and {len(other_flights)} other flights")
-            logger.info(f"Total flights: {len(flights)}")
+            logger.info("Found %d best flights and %d other flights", len(best_flights), len(other_flights))
         else:
-            logger.warning(f"No flights found in response. Available keys: {list(search_results.keys())}")
+            logger.warning("No flights found in response. Available keys: %s", list(search_results.keys()))
     
     return flights
 
 
+@traced("search_hotels")
 async def search_hotels(hotel_request: HotelRequest) -> list:
     """
     Fetch hotel information from SerpAPI with proper location handling.
@@ -91,46 +143,76 @@ async def search_hotels(hotel_request: HotelRequest) -> list:
     Returns:
         List of hotel data from SerpAPI
     """
-    logger.info(f"Searching hotels for: {hotel_request.location}")
-
-    # Get comprehensive location information
-    location_info = get_location_info(hotel_request.location)
-    
-    logger.info(f"Location analysis: {location_info}")
-    logger.info(f"Converted location query: {location_info['city_name']}")
-    logger.info(f"Using country code: {location_info['country_code']}")
-    logger.info(f"Is airport code: {location_info['is_airport_code']}")
+    logger.info("Searching hotels for: %s", hotel_request.location)
 
     # Build search parameters with proper location and geographic bias
-    params = {
-        "api_key": SERP_API_KEY,
-        "engine": SEARCH_ENGINES["hotels"],
-        "q": location_info["city_name"],
-        "gl": location_info["country_code"],
-        "check_in_date": hotel_request.check_in_date,
-        "check_out_date": hotel_request.check_out_date,
-        **DEFAULT_HOTEL_PARAMS
-    }
+    params = build_hotel_search_params(hotel_request)
+
+    logger.info("Converted location query: %s (country code: %s)", params["q"], params["gl"])
 
     search_results = await run_search(params)
-    logger.info(f"SerpAPI hotel response keys: {list(search_results.keys()) if search_results else 'None'}")
     
-    # Log the full response for debugging
+    # Log the raw response for debugging (sampled, truncated, DEBUG level only)
     if search_results:
-        logger.info(f"Full SerpAPI hotel response: {search_results}")
+        log_payload("SerpAPI hotel response", search_results)
     
     hotels = search_results.get("properties", [])
     if hotels:
-        logger.info(f"Found {len(hotels)} hotels")
-        # Log the first hotel's structure for debugging
-        if len(hotels) > 0:
-            logger.info(f"First hotel structure: {hotels[0]}")
+        logger.info("Found %d hotels", len(hotels))
     else:
-        logger.warning(f"No hotels found in response. Available keys: {list(search_results.keys()) if search_results else 'None'}")
+        logger.warning("No hotels found in response. Available keys: %s", list(search_results.keys()) if search_results else None)
     
     return hotels
 
 
+async def search_flight_records(flight_request: FlightRequest) -> List[FlightRecord]:
+    """
+    Search flights and return them as normalized records.
+
+    Records are cached per search for the engine's TTL, so repeated requests
+    for the same search (e.g. other pages or filters) reuse them.
+
+    Args:
+        flight_request: FlightRequest object containing search parameters
+
+    Returns:
+        List of FlightRecords in SerpAPI's order
+    """
+    params = build_flight_search_params(flight_request)
+    return await _cached_records(params, lambda: search_flights(flight_request), normalize_flights)
+
+
+async def search_hotel_records(hotel_request: HotelRequest) -> List[HotelRecord]:
+    """
+    Search hotels and return them as normalized records.
+
+    Records are cached per search for the engine's TTL, so repeated requests
+    for the same search (e.g. other pages or filters) reuse them.
+
+    Args:
+        hotel_request: HotelRequest object containing search parameters
+
+    Returns:
+        List of HotelRecords in SerpAPI's order
+    """
+    params = build_hotel_search_params(hotel_request)
+    return await _cached_records(params, lambda: search_hotels(hotel_request), normalize_hotels)
+
+
+async def _cached_records(params: dict, search, normalize) -> list:
+    cache_key = make_cache_key(params)
+    records = records_cache.get(cache_key)
+    if records is not None:
+        return records
+
+    records = normalize(await search())
+    # Empty results may come from a transient upstream problem; retry them next time
+    if records:
+        ttl = SEARCH_CACHE_TTLS.get(params.get("engine"), DEFAULT_SEARCH_CACHE_TTL)
+        records_cache.set(cache_key, records, ttl=ttl)
+    return records
+
+
 def build_flight_search_params(flight_request: FlightRequest) -> dict:
     """
     Build search parameters for flight search.
@@ -141,15 +223,20 @@ def build_flight_search_params(flight_request: FlightRequest) -> dict:
     Returns:
         Dictionary of search parameters
     """
-    return {
+    params = {
         "api_key": SERP_API_KEY,
         "engine": SEARCH_ENGINES["flights"],
         "departure_id": flight_request.origin.strip().upper(),
         "arrival_id": flight_request.destination.strip().upper(),
         "outbound_date": flight_request.outbound_date,
-        "return_date": flight_request.return_date,
         **DEFAULT_FLIGHT_PARAMS
     }
+    # Without a return date, search one-way fares
+    if flight_request.return_date:
+        params["return_date"] = flight_request.return_date
+    else:
+        params["type"] = FLIGHT_TRIP_TYPES["one_way"]
+    return params
 
 
 def build_hotel_search_params(hotel_request: HotelRequest) -> dict:
@@ -0,0 +1,94 @@
+"""
+Async SerpAPI client built on a pooled keep-alive HTTP connection.
+"""
+
+from typing import Optional
+import httpx
+
+from ..config import (
+    SERPAPI_BASE_URL, SERPAPI_TIMEOUT, SERPAPI_MAX_CONNECTIONS, logger
+)
+
+
+class SerpAPIError(Exception):
+    """Raised when SerpAPI returns an error response."""
+
+
+class SerpAPIClient:
+    """
+    Minimal async client for the SerpAPI ``/search.json`` endpoint.
+
+    A single instance keeps its HTTPS connections alive between searches, so
+    repeated searches skip the TCP/TLS handshake. ``base_url`` and
+    ``transport`` can point the client at a local stub server or an
+    in-process transport that replays recorded responses.
+    """
+
+    def __init__(
+        self,
+        base_url: str = SERPAPI_BASE_URL,
+        timeout: float = SERPAPI_TIMEOUT,
+        max_connections: int = SERPAPI_MAX_CONNECTIONS,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            transport=transport
+        )
+
+    async def search(self, params: dict) -> dict:
+        """
+        Run a SerpAPI search.
+
+        Args:
+            params: SerpAPI query parameters, including ``engine`` and ``api_key``
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            SerpAPIError: If SerpAPI reports an error or returns a non-JSON body
+        """
+        response = await self._client.get("/search.json", params=params)
+        try:
+            results = response.json()
+        except ValueError:
+            raise SerpAPIError(f"Invalid response from SerpAPI (HTTP {response.status_code})")
+
+        if response.status_code >= 400:
+            raise SerpAPIError(results.get("error") or f"HTTP {response.status_code}")
+        return results
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_client: Optional[SerpAPIClient] = None
+
+
+def get_serpapi_client() -> SerpAPIClient:
+    """Return the shared SerpAPI client, creating it on first use."""
+    global _client
+    if _client is None:
+        logger.info(f"Opening SerpAPI connection pool to {SERPAPI_BASE_URL}")
+        _client = SerpAPIClient()
+    return _client
+
+
+def set_serpapi_client(client: Optional[SerpAPIClient]) -> None:
+    """Replace the shared SerpAPI client (e.g. with one using a stub transport)."""
+    global _client
+    _client = client
+
+
+async def close_serpapi_client() -> None:
+    """Close the shared SerpAPI client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -8,6 +8,10 @@ API_BASE_URL = "http://localhost:8000"
 API_URL_FLIGHTS = f"{API_BASE_URL}/search_flights/"
 API_URL_HOTELS = f"{API_BASE_URL}/search_hotels/"
 API_URL_ITINERARY = f"{API_BASE_URL}/generate_itinerary/"
+API_URL_STREAM_FLIGHTS = f"{API_BASE_URL}/stream/search_flights/"
+API_URL_STREAM_HOTELS = f"{API_BASE_URL}/stream/search_hotels/"
+API_URL_STREAM_ITINERARY = f"{API_BASE_URL}/stream/generate_itinerary/"
+API_URL_ITINERARIES = f"{API_BASE_URL}/itineraries"
 
 # Page configuration
 st.set_page_config(
@@ -34,6 +38,30 @@ def make_api_call(url, data):
         st.error(f"Connection Error: {str(e)}")
         return None
 
+# Helper function to consume a Server-Sent Events stream from the API
+def stream_api_call(url, data):
+    """Yield (event, payload) pairs from a streaming endpoint as they arrive."""
+    try:
+        # The server sends keep-alives, so the read timeout only applies between events
+        with requests.post(url, json=data, stream=True, timeout=(5, 30)) as response:
+            if response.status_code != 200:
+                st.error(f"API Error: {response.status_code} - {response.text}")
+                return
+
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:") and event:
+                    payload = json.loads(line[len("data:"):].strip())
+                    if event == "error":
+                        st.error(f"API Error: {payload.get('status_code')} - {payload.get('detail')}")
+                        return
+                    yield event, payload
+                    event = None
+    except requests.exceptions.RequestException as e:
+        st.error(f"Connection Error: {str(e)}")
+
 # Initialize session state for storing search results
 if 'flight_results' not in st.session_state:
     st.session_state.flight_results = None
@@ -41,6 +69,20 @@ if 'hotel_results' not in st.session_state:
     st.session_state.hotel_results = None
 if 'itinerary_results' not in st.session_state:
     st.session_state.itinerary_results = None
+# Stored indices of the options picked for the itinerary in the latest search results
+if 'selected_flights' not in st.session_state:
+    st.session_state.selected_flights = []
+if 'selected_hotels' not in st.session_state:
+    st.session_state.selected_hotels = []
+
+# Add a flight or hotel to the itinerary selection
+def select_option(kind, index, label):
+    selected = st.session_state[kind]
+    if index not in selected:
+        selected.append(index)
+        st.success(f"Selected: {label}")
+    else:
+        st.info("Already selected!")
 
 # Create two columns for flight and hotel search
 col1, col2 = st.columns(2)
@@ -63,9 +105,25 @@ with col1:
                     "return_date": return_date.strftime("%Y-%m-%d")
                 }
                 
-                result = make_api_call(API_URL_FLIGHTS, flight_data)
-                if result:
+                progress = st.empty()
+                result = {"flights": [], "ai_flight_recommendation": "", "result_id": None}
+                completed = False
+                for event, payload in stream_api_call(API_URL_STREAM_FLIGHTS, flight_data):
+                    if event == "result":
+                        # The server keeps the results; the itinerary references them by id
+                        result["result_id"] = payload["result_id"]
+                    elif event == "flights":
+                        result["flights"] = payload
+                        progress.info(f"Found {len(payload)} flights, getting AI recommendation...")
+                    elif event == "ai_flight_recommendation":
+                        result["ai_flight_recommendation"] += payload
+                        progress.markdown(result["ai_flight_recommendation"])
+                    elif event == "done":
+                        completed = True
+                progress.empty()
+                if completed:
                     st.session_state.flight_results = result
+                    st.session_state.selected_flights = []
                     st.success("Flight search completed!")
         else:
             st.error("Please fill in both departure and arrival airports.")
@@ -95,9 +153,25 @@ with col2:
                     "check_out_date": check_out_date.strftime("%Y-%m-%d")
                 }
                 
-                result = make_api_call(API_URL_HOTELS, hotel_data)
-                if result:
+                progress = st.empty()
+                result = {"hotels": [], "ai_hotel_recommendation": "", "result_id": None}
+                completed = False
+                for event, payload in stream_api_call(API_URL_STREAM_HOTELS, hotel_data):
+                    if event == "result":
+                        # The server keeps the results; the itinerary references them by id
+                        result["result_id"] = payload["result_id"]
+                    elif event == "hotels":
+                        result["hotels"] = payload
+                        progress.info(f"Found {len(payload)} hotels, getting AI recommendation...")
+                    elif event == "ai_hotel_recommendation":
+                        result["ai_hotel_recommendation"] += payload
+                        progress.markdown(result["ai_hotel_recommendation"])
+                    elif event == "done":
+                        completed = True
+                progress.empty()
+                if completed:
                     st.session_state.hotel_results = result
+                    st.session_state.selected_hotels = []
                     st.success("Hotel search completed!")
         else:
             st.error("Please enter a location.")
@@ -161,6 +235,9 @@ with tab1:
                                 st.markdown(f"**Stops:** {flight.get('stops', 'N/A')}")
                             
                             st.markdown(f"**Class:** {flight.get('travel_class', 'Economy')}")
+                            
+                            if st.button("✏️ Select", key=f"select_flight_{i+j}"):
+                                select_option("selected_flights", flight["index"], flight.get('airline', 'Flight'))
                             st.divider()
     else:
         st.info("Search for flights to see available options here.")
@@ -220,16 +297,7 @@ with tab2:
                             button_col1, button_col2 = st.columns(2)
                             with button_col1:
                                 if st.button("✏️ Select", key=f"select_hotel_{i+j}"):
-                                    # Add hotel to selected list in session state
-                                    if 'selected_hotels' not in st.session_state:
-                                        st.session_state.selected_hotels = []
-                                    
-                                    hotel_id = f"hotel_{i+j}"
-                                    if hotel_id not in st.session_state.selected_hotels:
-                                        st.session_state.selected_hotels.append(hotel_id)
-                                        st.success(f"Selected: {hotel.get('name', 'Hotel')}")
-                                    else:
-                                        st.info("Hotel already selected!")
+                                    select_option("selected_hotels", hotel["index"], hotel.get('name', 'Hotel'))
                                         
                             with button_col2:
                                 if st.button("📋 Details", key=f"details_hotel_{i+j}"):
@@ -277,35 +345,86 @@ with tab4:
         with col2:
             trip_end = st.date_input("Trip End Date", min_value=datetime.now().date() + timedelta(days=1), key="trip_end")
         
-        # Pre-fill with search results if available
-        flight_info = "Flight information from search results" if st.session_state.flight_results else ""
-        hotel_info = "Hotel information from search results" if st.session_state.hotel_results else ""
+        flight_results = st.session_state.flight_results or {}
+        hotel_results = st.session_state.hotel_results or {}
+        flights_by_index = {flight["index"]: flight for flight in flight_results.get("flights", [])}
+        hotels_by_index = {hotel["index"]: hotel for hotel in hotel_results.get("hotels", [])}
+        selected_flights = [flights_by_index[i] for i in st.session_state.selected_flights]
+        selected_hotels = [hotels_by_index[i] for i in st.session_state.selected_hotels]
         
-        flights_info = st.text_area("Flight Information", value=flight_info, key="itinerary_flights")
-        hotels_info = st.text_area("Hotel Information", value=hotel_info, key="itinerary_hotels")
+        sel_col1, sel_col2 = st.columns(2)
+        with sel_col1:
+            st.markdown("**✈️ Flights for the itinerary**")
+            for flight in selected_flights:
+                st.markdown(f"- {flight.get('airline')} · {flight.get('price')} · {flight.get('departure')} → {flight.get('arrival')}")
+            if flight_results and not selected_flights:
+                st.caption("Select flights in the Flights tab; the best ranked results are used otherwise.")
+        with sel_col2:
+            st.markdown("**🏨 Hotels for the itinerary**")
+            for hotel in selected_hotels:
+                st.markdown(f"- {hotel.get('name')} · {hotel.get('price')} per night · ⭐ {hotel.get('rating')}")
+            if hotel_results and not selected_hotels:
+                st.caption("Select hotels in the Hotels tab; the best ranked results are used otherwise.")
+        
+        if (st.session_state.selected_flights or st.session_state.selected_hotels) and st.button("Clear Selection", key="clear_selection"):
+            st.session_state.selected_flights = []
+            st.session_state.selected_hotels = []
+            st.rerun()
         
         if st.button("Generate Itinerary", type="primary", key="generate_itinerary"):
-            if destination and flights_info and hotels_info:
+            if destination:
                 with st.spinner("Generating your personalized itinerary..."):
+                    # Reference the results stored on the server instead of re-sending them
                     itinerary_data = {
                         "destination": destination,
                         "check_in_date": trip_start.strftime("%Y-%m-%d"),
                         "check_out_date": trip_end.strftime("%Y-%m-%d"),
-                        "flights": flights_info,
-                        "hotels": hotels_info
+                        "flight_result_id": flight_results.get("result_id"),
+                        "flight_indices": st.session_state.selected_flights,
+                        "hotel_result_id": hotel_results.get("result_id"),
+                        "hotel_indices": st.session_state.selected_hotels
                     }
                     
-                    result = make_api_call(API_URL_ITINERARY, itinerary_data)
-                    if result:
-                        st.session_state.itinerary_results = result
+                    # Render each itinerary section as soon as it arrives
+                    progress = st.empty()
+                    itinerary = ""
+                    itinerary_id = None
+                    completed = False
+                    for event, payload in stream_api_call(API_URL_STREAM_ITINERARY, itinerary_data):
+                        if event == "itinerary":
+                            itinerary += payload
+                            progress.markdown(itinerary)
+                        elif event == "itinerary_id":
+                            # The server keeps the itinerary by day, so single days can be regenerated
+                            itinerary_id = payload["itinerary_id"]
+                        elif event == "done":
+                            completed = True
+                    progress.empty()
+                    if completed:
+                        st.session_state.itinerary_results = {"itinerary": itinerary, "itinerary_id": itinerary_id}
                         st.success("Itinerary generated successfully!")
             else:
-                st.error("Please fill in all required fields.")
+                st.error("Please enter a destination.")
     
     # Display generated itinerary
     if st.session_state.itinerary_results and st.session_state.itinerary_results.get("itinerary"):
         st.markdown("### 📋 Your Personalized Itinerary")
         st.markdown(st.session_state.itinerary_results["itinerary"])
+        
+        itinerary_id = st.session_state.itinerary_results.get("itinerary_id")
+        if itinerary_id:
+            st.markdown("#### 🔄 Change a Day")
+            regen_col1, regen_col2 = st.columns([1, 3])
+            with regen_col1:
+                day = st.number_input("Day", min_value=1, step=1, key="regenerate_day")
+            with regen_col2:
+                instructions = st.text_input("What should change?", placeholder="e.g., Rainy day, keep it indoors", key="regenerate_instructions")
+            if st.button(f"Regenerate Day {day}", key="regenerate_day_button"):
+                with st.spinner(f"Regenerating day {day}..."):
+                    result = make_api_call(f"{API_URL_ITINERARIES}/{itinerary_id}/days/{day}", {"instructions": instructions})
+                if result:
+                    st.session_state.itinerary_results = {"itinerary": result["itinerary"], "itinerary_id": itinerary_id}
+                    st.rerun()
     elif not (st.session_state.flight_results or st.session_state.hotel_results):
         st.info("Search for flights and hotels first to generate a personalized itinerary!")
 
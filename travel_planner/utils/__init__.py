@@ -12,11 +12,51 @@ from .transformers import (
     transform_serpapi_flights,
     transform_serpapi_hotels
 )
+from .records import (
+    FlightRecord,
+    HotelRecord,
+    normalize_flights,
+    normalize_hotels,
+    flight_records_to_models,
+    hotel_records_to_models
+)
+from .ranking import (
+    rank_flights,
+    rank_hotels,
+    pareto_front,
+    explain_flight_ranking,
+    explain_hotel_ranking
+)
+from .prompt_builder import (
+    build_flight_prompt,
+    build_hotel_prompt,
+    format_selected_flights,
+    format_selected_hotels,
+    estimate_tokens
+)
+from .filtering import (
+    filter_flights,
+    filter_hotels,
+    sort_flights,
+    sort_hotels,
+    paginate
+)
 from .formatters import (
     format_travel_data,
     format_flight_data,
-    format_hotel_data
+    format_hotel_data,
+    split_markdown_sections
+)
+from .itinerary import parse_itinerary, render_itinerary, outline_itinerary
+from .cache import (
+    MemoryCache,
+    SQLiteCache,
+    NullCache,
+    create_cache,
+    make_cache_key
 )
+from .singleflight import SingleFlight
+from .dates import parse_date
 
 __all__ = [
     # Location utilities
@@ -29,8 +69,54 @@ __all__ = [
     'transform_serpapi_flights',
     'transform_serpapi_hotels',
     
+    # Normalized records
+    'FlightRecord',
+    'HotelRecord',
+    'normalize_flights',
+    'normalize_hotels',
+    'flight_records_to_models',
+    'hotel_records_to_models',
+    
+    # Local ranking and prompt compaction
+    'rank_flights',
+    'rank_hotels',
+    'pareto_front',
+    'explain_flight_ranking',
+    'explain_hotel_ranking',
+    'build_flight_prompt',
+    'build_hotel_prompt',
+    'format_selected_flights',
+    'format_selected_hotels',
+    'estimate_tokens',
+    
+    # Filtering, sorting and pagination
+    'filter_flights',
+    'filter_hotels',
+    'sort_flights',
+    'sort_hotels',
+    'paginate',
+    
     # Response formatters
     'format_travel_data',
     'format_flight_data', 
-    'format_hotel_data'
+    'format_hotel_data',
+    'split_markdown_sections',
+    
+    # Itinerary sections
+    'parse_itinerary',
+    'render_itinerary',
+    'outline_itinerary',
+    
+    # Caching
+    'MemoryCache',
+    'SQLiteCache',
+    'NullCache',
+    'create_cache',
+    'make_cache_key',
+    
+    # Request coalescing
+    'SingleFlight',
+    
+    # Request dates
+    'parse_date'
 ]
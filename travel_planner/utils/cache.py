@@ -0,0 +1,232 @@
+"""
+Caching utilities with TTL expiry and LRU eviction.
+
+Two interchangeable backends are provided: an in-process ``MemoryCache`` and a
+``SQLiteCache`` that persists entries on disk so they survive restarts. Both
+store JSON-serializable values and expose the same ``get``/``set`` interface.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+
+def make_cache_key(params: Dict[str, Any], exclude: Iterable[str] = ("api_key",)) -> str:
+    """
+    Build a stable cache key from a dictionary of parameters.
+
+    Args:
+        params: Parameters to fingerprint (e.g. SerpAPI search params)
+        exclude: Keys that must not influence the cache key
+
+    Returns:
+        Hex digest identifying the normalized parameters
+    """
+    excluded = set(exclude)
+    normalized = {key: value for key, value in params.items() if key not in excluded}
+    payload = json.dumps(normalized, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CacheStats:
+    """Hit/miss counters shared by all cache backends."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hit_ratio, 4),
+        }
+
+
+class MemoryCache:
+    """Thread-safe in-process cache with per-entry TTL and bounded LRU size."""
+
+    def __init__(self, max_size: int = 512, default_ttl: float = 300):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (default TTL if omitted)."""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """On-disk cache backed by SQLite with per-entry TTL and bounded LRU size."""
+
+    def __init__(self, path: str, max_size: int = 512, default_ttl: float = 300):
+        self.path = path
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access)")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (default TTL if omitted)."""
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            overflow = count - self.max_size
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    " SELECT key FROM cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.stats.evictions += overflow
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class NullCache:
+    """Cache backend that never stores anything (caching disabled)."""
+
+    def __init__(self):
+        self.max_size = 0
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        self.stats.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        return None
+
+    def delete(self, key: str) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+    def __len__(self) -> int:
+        return 0
+
+
+def create_cache(backend: str, max_size: int, default_ttl: float, path: Optional[str] = None):
+    """
+    Create a cache instance for the configured backend.
+
+    Args:
+        backend: One of 'memory', 'sqlite' or 'none'
+        max_size: Maximum number of entries before LRU eviction
+        default_ttl: Default time-to-live in seconds
+        path: Database file for the 'sqlite' backend
+
+    Returns:
+        A cache object implementing get/set/delete/clear
+
+    Raises:
+        ValueError: If the backend name is not recognized
+    """
+    backend = (backend or "memory").strip().lower()
+    if backend == "memory":
+        return MemoryCache(max_size=max_size, default_ttl=default_ttl)
+    if backend == "sqlite":
+        return SQLiteCache(path or "cache.sqlite3", max_size=max_size, default_ttl=default_ttl)
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend: {backend}")
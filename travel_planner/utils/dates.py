@@ -0,0 +1,24 @@
+"""
+Parsing of the ISO dates in search and trip requests.
+"""
+
+from datetime import date
+
+from fastapi import HTTPException
+
+
+def parse_date(value: str, field: str) -> date:
+    """
+    Parse a YYYY-MM-DD request field.
+
+    Args:
+        value: Date string from the request
+        field: Name of the request field, used in the error message
+
+    Raises:
+        HTTPException: 400 if the value is not an ISO date
+    """
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {field}: expected YYYY-MM-DD, got {value!r}")
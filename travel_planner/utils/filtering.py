@@ -0,0 +1,93 @@
+"""
+Filtering, sorting and pagination of normalized search results.
+
+These run over the cached records of a search, so narrowing or paging
+through results never triggers another SerpAPI call.
+"""
+
+from typing import Dict, List, Optional, Sequence, TypeVar
+
+from ..models import FlightFilters, HotelFilters, Pagination
+from .ranking import rank_flights, rank_hotels
+from .records import FlightRecord, HotelRecord
+
+T = TypeVar("T")
+
+_NO_PRICE = float("inf")
+
+
+def filter_flights(records: List[FlightRecord], filters: FlightFilters) -> List[FlightRecord]:
+    """Keep the flights matching price, stops and airline limits."""
+    airline = filters.airline.strip().lower() if filters.airline else None
+    return [
+        record for record in records
+        if (filters.max_price is None or (record.price and record.price <= filters.max_price))
+        and (filters.max_stops is None or record.stops <= filters.max_stops)
+        and (airline is None or airline in record.airline.lower())
+    ]
+
+
+def filter_hotels(records: List[HotelRecord], filters: HotelFilters) -> List[HotelRecord]:
+    """Keep the hotels matching price and rating limits."""
+    return [
+        record for record in records
+        if (filters.max_price is None or (record.price and record.price <= filters.max_price))
+        and (filters.min_rating is None or record.rating >= filters.min_rating)
+    ]
+
+
+def sort_flights(records: List[FlightRecord], sort: Optional[str],
+                 weights: Dict[str, float]) -> List[FlightRecord]:
+    """
+    Order flights by a sort key.
+
+    Args:
+        records: Flight records
+        sort: 'price', 'duration', 'stops', 'departure', 'rank' or None to keep SerpAPI's order
+        weights: Ranking weights used for 'rank'
+
+    Returns:
+        The sorted records; flights without a price sort last by price
+    """
+    if sort == "rank":
+        return rank_flights(records, weights)
+    if sort == "price":
+        return sorted(records, key=lambda record: record.price or _NO_PRICE)
+    if sort == "duration":
+        return sorted(records, key=lambda record: record.duration_minutes)
+    if sort == "stops":
+        return sorted(records, key=lambda record: record.stops)
+    if sort == "departure":
+        return sorted(records, key=lambda record: record.departure)
+    return records
+
+
+def sort_hotels(records: List[HotelRecord], sort: Optional[str],
+                weights: Dict[str, float]) -> List[HotelRecord]:
+    """
+    Order hotels by a sort key.
+
+    Args:
+        records: Hotel records
+        sort: 'price', 'rating', 'reviews', 'rank' or None to keep SerpAPI's order
+        weights: Ranking weights used for 'rank'
+
+    Returns:
+        The sorted records; hotels without a price sort last by price,
+        ratings and reviews sort highest first
+    """
+    if sort == "rank":
+        return rank_hotels(records, weights)
+    if sort == "price":
+        return sorted(records, key=lambda record: record.price or _NO_PRICE)
+    if sort == "rating":
+        return sorted(records, key=lambda record: record.rating, reverse=True)
+    if sort == "reviews":
+        return sorted(records, key=lambda record: record.reviews, reverse=True)
+    return records
+
+
+def paginate(items: Sequence[T], pagination: Pagination) -> List[T]:
+    """Return the items of the requested 1-based page."""
+    start = (pagination.page - 1) * pagination.page_size
+    return list(items[start:start + pagination.page_size])
@@ -1,3 +1,9 @@
+from .metrics import timed_stage
+from .tracing import traced
+
+
+@timed_stage("format_travel_data")
+@traced("format_travel_data")
 def format_travel_data(data_type, data):
     """Format travel data for AI analysis."""
     if not data:
@@ -51,3 +57,24 @@ Hotel {i}:
         formatted_hotels.append(hotel_info)
     
     return "\n".join(formatted_hotels)
+
+
+def split_markdown_sections(text):
+    """
+    Split markdown into chunks that each start at a heading line.
+
+    Joining the returned chunks reproduces the original text exactly.
+    """
+    if not text:
+        return []
+
+    sections = []
+    current = []
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith("#") and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return sections
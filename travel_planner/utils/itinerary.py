@@ -0,0 +1,81 @@
+"""
+Structured, per-section view of generated itineraries.
+
+The itinerary prompt asks for ``#`` main headings and a ``##`` heading per
+day, so an itinerary splits into a preamble (title and overview) followed by
+level-2 sections, most of them days. Sections can then be replaced one at a
+time and the document reassembled, instead of regenerating all of it.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+_SECTION_HEADING = re.compile(r"^##(?!#)\s*(.*?)\s*#*\s*$")
+_DAY_NUMBER = re.compile(r"\bday\s*(\d+)", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"^\s*[-*+]\s+")
+
+
+def section_day(title: str) -> Optional[int]:
+    """Day number named in a section heading (e.g. 'Day 3: Old Town'), if any."""
+    match = _DAY_NUMBER.search(title)
+    return int(match.group(1)) if match else None
+
+
+def parse_itinerary(markdown: str) -> Tuple[str, List[Dict]]:
+    """
+    Split itinerary markdown at its level-2 headings.
+
+    Headings inside fenced code blocks are ignored. Rendering the result with
+    ``render_itinerary`` reproduces the input exactly.
+
+    Args:
+        markdown: Itinerary text
+
+    Returns:
+        The preamble before the first section, and one dict per section with
+        'title', 'day' (or None) and 'markdown' (heading line included)
+    """
+    preamble: List[str] = []
+    sections: List[Dict] = []
+    in_fence = False
+    for line in (markdown or "").splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        heading = None if in_fence else _SECTION_HEADING.match(line.rstrip("\r\n"))
+        if heading:
+            title = heading.group(1)
+            sections.append({"title": title, "day": section_day(title), "markdown": line})
+        elif sections:
+            sections[-1]["markdown"] += line
+        else:
+            preamble.append(line)
+    return "".join(preamble), sections
+
+
+def render_itinerary(preamble: str, sections: List[Dict]) -> str:
+    """Reassemble itinerary markdown from its preamble and sections."""
+    return preamble + "".join(section["markdown"] for section in sections)
+
+
+def outline_itinerary(sections: List[Dict], exclude: int, max_items: int = 6, max_chars: int = 60) -> str:
+    """
+    Compact outline of all sections but one, for context in a section rewrite.
+
+    Args:
+        sections: Parsed sections
+        exclude: Index of the section being rewritten
+        max_items: List items kept per section
+        max_chars: Characters kept per list item
+
+    Returns:
+        One heading line per section, each followed by its first list items, shortened
+    """
+    lines = []
+    for index, section in enumerate(sections):
+        if index == exclude:
+            lines.append(f"## {section['title']} (being rewritten)")
+            continue
+        lines.append(f"## {section['title']}")
+        items = [line.strip() for line in section["markdown"].splitlines()[1:] if _LIST_ITEM.match(line)]
+        lines.extend(item if len(item) <= max_chars else item[:max_chars - 3] + "..." for item in items[:max_items])
+    return "\n".join(lines)
@@ -4,6 +4,7 @@ Location utility functions for handling airport codes and city conversions.
 
 from typing import Optional
 from ..constants import AIRPORT_TO_CITY, AIRPORT_TO_COUNTRY, DEFAULT_COUNTRY_CODE
+from .tracing import traced
 
 
 def convert_airport_code_to_city(location: str) -> str:
@@ -57,6 +58,7 @@ def is_airport_code(location: str) -> bool:
     return location_upper in AIRPORT_TO_CITY
 
 
+@traced("get_location_info")
 def get_location_info(location: str) -> dict:
     """
     Get comprehensive location information including city name and country code.
@@ -0,0 +1,175 @@
+"""
+Compact, token-budgeted prompt text for AI analysis.
+
+Instead of listing every search result verbatim, candidates are ranked
+locally, near-identical options are dropped and the best ones are encoded as
+a pipe-separated table until the token budget is used up. The prompt size,
+and with it LLM latency and cost, stays flat however many results SerpAPI
+returns.
+"""
+
+from typing import Callable, Dict, Hashable, List, Tuple, TypeVar
+
+from ..constants import CHARS_PER_TOKEN, DEFAULT_FLIGHT_RANKING_WEIGHTS, DEFAULT_HOTEL_RANKING_WEIGHTS
+from ..models import FlightInfo, HotelInfo
+from .ranking import rank_flights, rank_hotels
+from .records import FlightRecord, HotelRecord
+from .metrics import timed_stage
+from .tracing import traced
+
+T = TypeVar("T")
+
+FLIGHT_COLUMNS = "#|airline|price|duration|stops|departure|arrival|class"
+HOTEL_COLUMNS = "#|name|price/night|rating|reviews|location"
+SELECTED_HOTEL_COLUMNS = "#|name|price/night|rating|location"
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the LLM token count of ``text`` (about 4 characters per token)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def dedupe(records: List[T], key: Callable[[T], Hashable]) -> Tuple[List[T], int]:
+    """
+    Keep the first record for each key.
+
+    Returns:
+        The unique records, in order, and the number of records dropped
+    """
+    seen = set()
+    unique = []
+    for record in records:
+        record_key = key(record)
+        if record_key not in seen:
+            seen.add(record_key)
+            unique.append(record)
+    return unique, len(records) - len(unique)
+
+
+def _flight_key(record: FlightRecord):
+    # Same airline on the same schedule: fare variants of one option
+    return record.airline, record.departure, record.arrival, record.stops
+
+
+def _hotel_key(record: HotelRecord):
+    return " ".join(record.name.lower().split())
+
+
+def _flight_row(rank: int, record: FlightRecord) -> str:
+    stops = f"{record.stops_text} via {'/'.join(record.layovers)}" if record.layovers else record.stops_text
+    departure = f"{record.departure} {record.departure_airport}".strip()
+    arrival = f"{record.arrival} {record.arrival_airport}".strip()
+    return (f"{rank}|{record.airline}|{record.price_text}|{record.duration_text}|{stops}|"
+            f"{departure}|{arrival}|{record.travel_class}")
+
+
+def _hotel_row(rank: int, record: HotelRecord) -> str:
+    return f"{rank}|{record.name}|{record.price_text}|{record.rating}|{record.reviews}|{record.location}"
+
+
+def _build_table(kind: str, criteria: str, columns: str, rows: List[str], total: int,
+                 duplicates: int, token_budget: int) -> str:
+    # Reserve room for the summary line, whose final length is known only at the end
+    summary_template = (f"{{shown}} best of {total} {kind}, ranked by {criteria}"
+                        f" ({duplicates} near-duplicates removed):")
+    used = estimate_tokens(summary_template) + 2 + estimate_tokens(columns) + 1
+
+    selected = []
+    for row in rows:
+        cost = estimate_tokens(row) + 1
+        # Always include the top candidate, even on a tiny budget
+        if selected and used + cost > token_budget:
+            break
+        selected.append(row)
+        used += cost
+
+    return "\n".join([summary_template.format(shown=len(selected)), columns, *selected])
+
+
+@timed_stage("build_flight_prompt")
+@traced("build_flight_prompt")
+def build_flight_prompt(records: List[FlightRecord], token_budget: int, max_candidates: int,
+                        weights: Dict[str, float] = DEFAULT_FLIGHT_RANKING_WEIGHTS) -> str:
+    """
+    Rank, deduplicate and tabulate flights within a token budget.
+
+    Args:
+        records: Normalized flight records
+        token_budget: Approximate maximum number of tokens for the text
+        max_candidates: Maximum number of flights to include
+        weights: Ranking weights per criterion (see ``rank_flights``)
+
+    Returns:
+        Prompt text listing the best flights first
+    """
+    if not records:
+        return "No flight data available."
+
+    ranked, duplicates = dedupe(rank_flights(records, weights), _flight_key)
+    rows = [_flight_row(rank, record) for rank, record in enumerate(ranked[:max_candidates], 1)]
+    return _build_table("flights", "price, duration and stops", FLIGHT_COLUMNS, rows,
+                        len(records), duplicates, token_budget)
+
+
+@timed_stage("build_hotel_prompt")
+@traced("build_hotel_prompt")
+def build_hotel_prompt(records: List[HotelRecord], token_budget: int, max_candidates: int,
+                       weights: Dict[str, float] = DEFAULT_HOTEL_RANKING_WEIGHTS) -> str:
+    """
+    Rank, deduplicate and tabulate hotels within a token budget.
+
+    Args:
+        records: Normalized hotel records
+        token_budget: Approximate maximum number of tokens for the text
+        max_candidates: Maximum number of hotels to include
+        weights: Ranking weights per criterion (see ``rank_hotels``)
+
+    Returns:
+        Prompt text listing the best hotels first
+    """
+    if not records:
+        return "No hotel data available."
+
+    ranked, duplicates = dedupe(rank_hotels(records, weights), _hotel_key)
+    rows = [_hotel_row(rank, record) for rank, record in enumerate(ranked[:max_candidates], 1)]
+    return _build_table("hotels", "price and rating", HOTEL_COLUMNS, rows,
+                        len(records), duplicates, token_budget)
+
+
+def format_selected_flights(flights: List[FlightInfo]) -> str:
+    """
+    Tabulate the flights a user picked, for the itinerary prompt.
+
+    Args:
+        flights: Selected FlightInfo objects, in order of preference
+
+    Returns:
+        Compact prompt text, or a note that no flight was selected
+    """
+    if not flights:
+        return "No flight selected."
+    rows = [
+        f"{i}|{flight.airline}|{flight.price}|{flight.duration}|{flight.stops}|"
+        f"{flight.departure}|{flight.arrival}|{flight.travel_class}"
+        for i, flight in enumerate(flights, 1)
+    ]
+    return "\n".join([f"{len(flights)} selected flights:", FLIGHT_COLUMNS, *rows])
+
+
+def format_selected_hotels(hotels: List[HotelInfo]) -> str:
+    """
+    Tabulate the hotels a user picked, for the itinerary prompt.
+
+    Args:
+        hotels: Selected HotelInfo objects, in order of preference
+
+    Returns:
+        Compact prompt text, or a note that no hotel was selected
+    """
+    if not hotels:
+        return "No hotel selected."
+    rows = [
+        f"{i}|{hotel.name}|{hotel.price}|{hotel.rating}|{hotel.location}"
+        for i, hotel in enumerate(hotels, 1)
+    ]
+    return "\n".join([f"{len(hotels)} selected hotels:", SELECTED_HOTEL_COLUMNS, *rows])
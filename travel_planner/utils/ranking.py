@@ -0,0 +1,244 @@
+"""
+Deterministic local ranking of normalized flight and hotel records.
+
+Each criterion is min-max normalized across the result set into a cost in
+[0, 1] (0 is best), and a record's score is the weighted sum of its costs.
+Records on the Pareto front (not beaten on every criterion at once by any
+other record) are ranked ahead of dominated ones, each group ordered by
+score. Records without a price are ranked as the most expensive.
+
+The ranking is also turned into a short templated explanation, so a
+recommendation can be served without an LLM round trip.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..constants import DEFAULT_FLIGHT_RANKING_WEIGHTS, DEFAULT_HOTEL_RANKING_WEIGHTS
+from .records import FlightRecord, HotelRecord
+
+
+def _normalizer(values: Sequence[float]) -> Callable[[float], float]:
+    low, high = min(values), max(values)
+    if high == low:
+        return lambda value: 0.0
+    span = high - low
+    return lambda value: (value - low) / span
+
+
+def _price_or_max(prices: List[Optional[float]]) -> List[float]:
+    known = [price for price in prices if price]
+    worst = max(known) if known else 0.0
+    return [price if price else worst for price in prices]
+
+
+def flight_costs(records: List[FlightRecord]) -> Dict[str, List[float]]:
+    """Per-criterion costs in [0, 1] for each flight, keyed by criterion."""
+    prices = _price_or_max([record.price for record in records])
+    durations = [record.duration_minutes for record in records]
+    stops = [record.stops for record in records]
+    price_cost, duration_cost, stops_cost = _normalizer(prices), _normalizer(durations), _normalizer(stops)
+    return {
+        "price": [price_cost(price) for price in prices],
+        "duration": [duration_cost(duration) for duration in durations],
+        "stops": [stops_cost(count) for count in stops],
+    }
+
+
+def hotel_costs(records: List[HotelRecord]) -> Dict[str, List[float]]:
+    """Per-criterion costs in [0, 1] for each hotel, keyed by criterion."""
+    prices = _price_or_max([record.price for record in records])
+    ratings = [record.rating for record in records]
+    price_cost, rating_cost = _normalizer(prices), _normalizer(ratings)
+    return {
+        "price": [price_cost(price) for price in prices],
+        # Higher ratings are better, so invert
+        "rating": [1.0 - rating_cost(rating) for rating in ratings],
+    }
+
+
+def _weighted_scores(costs: Dict[str, List[float]], weights: Dict[str, float], count: int) -> List[float]:
+    scores = [0.0] * count
+    for criterion, weight in weights.items():
+        if weight and criterion in costs:
+            for i, cost in enumerate(costs[criterion]):
+                scores[i] += weight * cost
+    return scores
+
+
+def pareto_front(costs: Dict[str, List[float]]) -> List[bool]:
+    """
+    Flag the records that no other record dominates.
+
+    A record is dominated if another one is at least as good on every
+    criterion and strictly better on one. Candidates are visited in
+    lexicographic cost order, where a dominating record always comes first,
+    so each one is only compared against the front found so far. Identical
+    vectors are adjacent in that order and share one front entry, so repeated
+    fares do not grow the front.
+    """
+    vectors = list(zip(*costs.values()))
+    on_front = [False] * len(vectors)
+    front: List[Tuple[float, ...]] = []
+    for i in sorted(range(len(vectors)), key=vectors.__getitem__):
+        vector = vectors[i]
+        if front and vector == front[-1]:
+            on_front[i] = True
+            continue
+        dominated = any(all(a <= b for a, b in zip(other, vector)) for other in front)
+        if not dominated:
+            front.append(vector)
+            on_front[i] = True
+    return on_front
+
+
+def _rank(costs: Dict[str, List[float]], weights: Dict[str, float], count: int) -> List[int]:
+    """Indices ordered Pareto front first, then by weighted score."""
+    scores = _weighted_scores(costs, weights, count)
+    on_front = pareto_front(costs)
+    return sorted(range(count), key=lambda i: (not on_front[i], scores[i]))
+
+
+def rank_flights(records: List[FlightRecord],
+                 weights: Dict[str, float] = DEFAULT_FLIGHT_RANKING_WEIGHTS) -> List[FlightRecord]:
+    """
+    Order flights from best to worst by price, duration and stops.
+
+    Args:
+        records: Normalized flight records
+        weights: Weight per criterion ('price', 'duration', 'stops')
+
+    Returns:
+        Pareto-optimal flights first, each group by ascending weighted score
+        (ties keep SerpAPI's order)
+    """
+    if not records:
+        return []
+    return [records[i] for i in _rank(flight_costs(records), weights, len(records))]
+
+
+def rank_hotels(records: List[HotelRecord],
+                weights: Dict[str, float] = DEFAULT_HOTEL_RANKING_WEIGHTS) -> List[HotelRecord]:
+    """
+    Order hotels from best to worst by price and rating.
+
+    Args:
+        records: Normalized hotel records
+        weights: Weight per criterion ('price', 'rating')
+
+    Returns:
+        Pareto-optimal hotels first, each group by ascending weighted score
+        (ties keep SerpAPI's order)
+    """
+    if not records:
+        return []
+    return [records[i] for i in _rank(hotel_costs(records), weights, len(records))]
+
+
+def _format_weights(weights: Dict[str, float]) -> str:
+    total = sum(weights.values()) or 1
+    return ", ".join(f"{criterion} {weight / total:.0%}" for criterion, weight in weights.items() if weight)
+
+
+def _format_minutes(minutes: int) -> str:
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m" if hours else f"{minutes}m"
+
+
+def explain_flight_ranking(ranked: List[FlightRecord], weights: Dict[str, float]) -> str:
+    """
+    Templated markdown explanation of the top-ranked flight.
+
+    Args:
+        ranked: Flights as returned by ``rank_flights``
+        weights: Weights used for the ranking
+
+    Returns:
+        Markdown recommendation text
+    """
+    if not ranked:
+        return "No flights found to recommend."
+
+    best = ranked[0]
+    priced = [record for record in ranked if record.price]
+    cheapest = min(priced, key=lambda record: record.price) if priced else None
+    fastest = min(ranked, key=lambda record: record.duration_minutes)
+    fewest_stops = min(record.stops for record in ranked)
+    front_size = sum(pareto_front(flight_costs(ranked)))
+
+    if cheapest is None or not best.price:
+        price_line = f"Price: {best.price_text}"
+    elif best.price == cheapest.price:
+        price_line = f"Price: {best.price_text}, the cheapest of {len(ranked)} options"
+    else:
+        price_line = (f"Price: {best.price_text}, ${best.price - cheapest.price:g} more than the cheapest "
+                      f"({cheapest.airline}, {cheapest.price_text})")
+
+    if best.duration_minutes == fastest.duration_minutes:
+        duration_line = f"Duration: {best.duration_text}, the fastest option"
+    else:
+        extra = _format_minutes(best.duration_minutes - fastest.duration_minutes)
+        duration_line = f"Duration: {best.duration_text}, {extra} longer than the fastest ({fastest.airline})"
+
+    if best.stops == fewest_stops:
+        stops_line = f"Stops: {best.stops_text}, the fewest available"
+    else:
+        stops_line = f"Stops: {best.stops_text} ({fewest_stops} is the minimum available)"
+
+    return "\n".join([
+        "## Recommended Flight",
+        f"**{best.airline}** departing {best.departure} and arriving {best.arrival} ({best.travel_class}).",
+        "",
+        f"- {price_line}",
+        f"- {duration_line}",
+        f"- {stops_line}",
+        "",
+        f"{front_size} of {len(ranked)} flights are Pareto-optimal: no other flight matches them on price, "
+        f"duration and stops while beating them on one. Ranked locally by {_format_weights(weights)}.",
+    ])
+
+
+def explain_hotel_ranking(ranked: List[HotelRecord], weights: Dict[str, float]) -> str:
+    """
+    Templated markdown explanation of the top-ranked hotel.
+
+    Args:
+        ranked: Hotels as returned by ``rank_hotels``
+        weights: Weights used for the ranking
+
+    Returns:
+        Markdown recommendation text
+    """
+    if not ranked:
+        return "No hotels found to recommend."
+
+    best = ranked[0]
+    priced = [record for record in ranked if record.price]
+    cheapest = min(priced, key=lambda record: record.price) if priced else None
+    top_rated = max(ranked, key=lambda record: record.rating)
+    front_size = sum(pareto_front(hotel_costs(ranked)))
+
+    if cheapest is None or not best.price:
+        price_line = f"Price: {best.price_text} per night"
+    elif best.price == cheapest.price:
+        price_line = f"Price: {best.price_text} per night, the cheapest of {len(ranked)} options"
+    else:
+        price_line = (f"Price: {best.price_text} per night, ${best.price - cheapest.price:g} more than the "
+                      f"cheapest ({cheapest.name}, {cheapest.price_text})")
+
+    if best.rating == top_rated.rating:
+        rating_line = f"Rating: {best.rating}, the highest rated option"
+    else:
+        rating_line = f"Rating: {best.rating} (highest is {top_rated.rating}, {top_rated.name})"
+    if best.reviews:
+        rating_line += f", from {best.reviews} reviews"
+
+    return "\n".join([
+        "## Recommended Hotel",
+        f"**{best.name}** ({best.location}).",
+        "",
+        f"- {price_line}",
+        f"- {rating_line}",
+        "",
+        f"{front_size} of {len(ranked)} hotels are Pareto-optimal: no other hotel matches them on price "
+        f"and rating while beating them on one. Ranked locally by {_format_weights(weights)}.",
+    ])
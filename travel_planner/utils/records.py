@@ -0,0 +1,173 @@
+"""
+Normalized flight and hotel records parsed once from raw SerpAPI results.
+
+Each raw item is walked a single time into a compact record holding typed
+values (numeric price, duration in minutes, stop count, rating). Both the
+API models (FlightInfo/HotelInfo) and the LLM prompt text are derived from
+these records, so the raw SerpAPI structures are never re-walked.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..models import FlightInfo, HotelInfo
+from .metrics import timed_stage
+from .tracing import traced
+
+
+class FlightRecord(NamedTuple):
+    airline: str
+    price: Optional[float]
+    duration_minutes: int
+    stops: int
+    layovers: Tuple[str, ...]
+    departure: str
+    departure_airport: str
+    arrival: str
+    arrival_airport: str
+    travel_class: str
+    return_date: str
+    airline_logo: str
+
+    @property
+    def price_text(self) -> str:
+        return f"${self.price}" if self.price else "N/A"
+
+    @property
+    def duration_text(self) -> str:
+        hours, minutes = divmod(self.duration_minutes, 60)
+        return f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
+
+    @property
+    def stops_text(self) -> str:
+        if self.stops == 0:
+            return "Direct"
+        return f"{self.stops} stop{'s' if self.stops != 1 else ''}"
+
+
+class HotelRecord(NamedTuple):
+    name: str
+    price: Optional[float]
+    price_text: str
+    rating: float
+    reviews: int
+    location: str
+    link: str
+
+
+def parse_price(value: Any) -> Optional[float]:
+    """Parse a SerpAPI price (number or text such as '$1,234') into a number."""
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        digits = "".join(ch for ch in value if ch.isdigit() or ch == ".")
+        try:
+            return float(digits) if digits else None
+        except ValueError:
+            return None
+    return None
+
+
+def normalize_flight(flight_data: Dict[str, Any]) -> FlightRecord:
+    """Parse one raw SerpAPI flight option into a FlightRecord."""
+    # SerpAPI nests the individual legs under 'flights'
+    segments = flight_data.get("flights", [])
+    first_segment = segments[0] if segments else {}
+    departure_info = first_segment.get("departure_airport", {})
+    arrival_info = segments[-1].get("arrival_airport", {}) if segments else {}
+    layovers = flight_data.get("layovers", [])
+
+    return FlightRecord(
+        airline=first_segment.get("airline", "Multiple Airlines"),
+        price=flight_data.get("price", 0),
+        duration_minutes=flight_data.get("total_duration", 0),
+        stops=len(layovers),
+        layovers=tuple(layover.get("id") or layover.get("name", "") for layover in layovers),
+        departure=departure_info.get("time", "N/A"),
+        departure_airport=departure_info.get("id", ""),
+        arrival=arrival_info.get("time", "N/A"),
+        arrival_airport=arrival_info.get("id", ""),
+        travel_class=first_segment.get("travel_class", "Economy"),
+        return_date=flight_data.get("return_date", "N/A"),
+        airline_logo=flight_data.get("airline_logo", first_segment.get("airline_logo", ""))
+    )
+
+
+def normalize_hotel(hotel_data: Dict[str, Any]) -> HotelRecord:
+    """Parse one raw SerpAPI hotel property into a HotelRecord."""
+    # SerpAPI has no address field; use the nearest landmark, then GPS coordinates
+    location = "Location not specified"
+    nearby_places = hotel_data.get("nearby_places", [])
+    if nearby_places and nearby_places[0].get("name"):
+        location = f"Near {nearby_places[0]['name']}"
+    else:
+        gps = hotel_data.get("gps_coordinates", {})
+        if gps.get("latitude") and gps.get("longitude"):
+            location = f"Coordinates: {round(gps['latitude'], 2)}, {round(gps['longitude'], 2)}"
+
+    # SerpAPI already includes the $ sign in the lowest price
+    price_info = hotel_data.get("rate_per_night", {})
+    if isinstance(price_info, dict):
+        price_str = price_info.get("lowest") or price_info.get("rate") or price_info.get("price")
+        price = price_info.get("extracted_lowest")
+    else:
+        price_str = hotel_data.get("price") or hotel_data.get("rate")
+        price = None
+    if price is None:
+        price = parse_price(price_str)
+
+    return HotelRecord(
+        name=hotel_data.get("name", "Unknown Hotel"),
+        price=price,
+        price_text=str(price_str) if price_str else "Price not available",
+        rating=float(hotel_data.get("overall_rating", 0.0) or hotel_data.get("rating", 0.0) or 0.0),
+        reviews=int(hotel_data.get("reviews", 0) or 0),
+        location=location,
+        link=hotel_data.get("link", "")
+    )
+
+
+@timed_stage("normalize_flights")
+@traced("normalize_flights")
+def normalize_flights(raw_flights: List[Dict[str, Any]]) -> List[FlightRecord]:
+    """Parse raw SerpAPI flight options into FlightRecords."""
+    return [normalize_flight(flight_data) for flight_data in raw_flights or []]
+
+
+@timed_stage("normalize_hotels")
+@traced("normalize_hotels")
+def normalize_hotels(raw_hotels: List[Dict[str, Any]]) -> List[HotelRecord]:
+    """Parse raw SerpAPI hotel properties into HotelRecords."""
+    return [normalize_hotel(hotel_data) for hotel_data in raw_hotels or []]
+
+
+def flight_records_to_models(records: List[FlightRecord]) -> List[FlightInfo]:
+    """Build FlightInfo models from records."""
+    # pydantic-core validation of these flat string fields is faster than model_construct
+    return [
+        FlightInfo(
+            airline=record.airline,
+            price=record.price_text,
+            duration=record.duration_text,
+            stops=record.stops_text,
+            departure=record.departure,
+            arrival=record.arrival,
+            travel_class=record.travel_class,
+            return_date=record.return_date,
+            airline_logo=record.airline_logo
+        )
+        for record in records
+    ]
+
+
+def hotel_records_to_models(records: List[HotelRecord]) -> List[HotelInfo]:
+    """Build HotelInfo models from records."""
+    return [
+        HotelInfo(
+            name=record.name,
+            price=record.price_text,
+            rating=record.rating,
+            location=record.location,
+            link=record.link
+        )
+        for record in records
+    ]
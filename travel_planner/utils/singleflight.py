@@ -0,0 +1,45 @@
+"""
+Single-flight request coalescing for concurrent identical async calls.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls that share a key.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task instead of starting their own. The
+    shared task is shielded, so one caller being cancelled does not cancel
+    the work for the others.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``fn`` once per key among concurrent callers.
+
+        Args:
+            key: Identifier of the work; identical keys are coalesced
+            fn: Zero-argument coroutine function performing the work
+
+        Returns:
+            The result of the shared call (exceptions are shared as well)
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
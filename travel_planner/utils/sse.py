@@ -0,0 +1,48 @@
+"""
+Helpers for streaming responses as Server-Sent Events (SSE).
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable
+
+from ..constants import SSE_KEEPALIVE_INTERVAL
+from .formatters import split_markdown_sections
+
+
+def sse_event(event: str, data: Any) -> str:
+    """
+    Encode one Server-Sent Event.
+
+    The payload is JSON-encoded so multi-line text stays on a single data line.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_markdown_result(event: str, result: Awaitable[str]) -> AsyncIterator[str]:
+    """
+    Await a long-running markdown result and stream it section by section.
+
+    Keep-alive comments are sent while waiting so clients and proxies do
+    not time out the connection.
+
+    Args:
+        event: Event name used for each section
+        result: Awaitable producing the markdown text
+
+    Yields:
+        Encoded SSE frames
+    """
+    task = asyncio.ensure_future(result)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=SSE_KEEPALIVE_INTERVAL)
+            if done:
+                break
+            yield ": keep-alive\n\n"
+    finally:
+        if not task.done():
+            task.cancel()
+
+    for section in split_markdown_sections(task.result()):
+        yield sse_event(event, section)
@@ -0,0 +1,162 @@
+"""
+Opt-in per-request tracing of search, transform and AI stages.
+
+Spans carry the request id, optional attributes such as a search params
+fingerprint, and timings. Finished spans are appended to a local file in the
+Chrome trace event format, which can be opened offline in ``chrome://tracing``
+or https://ui.perfetto.dev. When tracing is disabled, ``span`` returns a
+shared no-op context manager and ``traced`` calls straight through.
+"""
+
+import atexit
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Optional
+
+_NOOP_SPAN = nullcontext()
+_request_id = contextvars.ContextVar("trace_request_id", default=None)
+_parent_span_id = contextvars.ContextVar("trace_parent_span_id", default=None)
+_span_ids = itertools.count(1)
+
+
+class ChromeTraceExporter:
+    """Append complete ('X') events to a file in the Chrome trace JSON array format."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", encoding="utf-8")
+        if is_new:
+            # The closing bracket is optional in this format, so appending is safe
+            self._file.write("[\n")
+        atexit.register(self.close)
+
+    def export(self, event: dict) -> None:
+        line = json.dumps(event, default=str) + ",\n"
+        with self._lock:
+            self._file.write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class _Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.exporter: Optional[ChromeTraceExporter] = None
+
+
+_tracer = _Tracer()
+
+
+def configure_tracing(enabled: bool, path: str) -> None:
+    """Enable or disable tracing, exporting spans to ``path``."""
+    _tracer.enabled = enabled
+    _tracer.exporter = ChromeTraceExporter(path) if enabled else None
+
+
+def tracing_enabled() -> bool:
+    return _tracer.enabled
+
+
+def begin_request(request_id: str) -> None:
+    """Attach a request id to all spans created in the current context."""
+    _request_id.set(request_id)
+
+
+class Span:
+    """A timed stage; use as a context manager."""
+
+    __slots__ = ("name", "attributes", "span_id", "parent_id", "_start", "_start_perf", "_token")
+
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent_id = None
+        self._start = 0.0
+        self._start_perf = 0.0
+        self._token = None
+
+    def set(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.parent_id = _parent_span_id.get()
+        self._token = _parent_span_id.set(self.span_id)
+        self._start = time.time()
+        self._start_perf = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start_perf
+        _parent_span_id.reset(self._token)
+        if exc_type is not None:
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+
+        exporter = _tracer.exporter
+        if exporter is not None:
+            exporter.export({
+                "name": self.name,
+                "cat": "travel_planner",
+                "ph": "X",
+                "ts": int(self._start * 1e6),
+                "dur": int(duration * 1e6),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {
+                    "request_id": _request_id.get(),
+                    "span_id": self.span_id,
+                    "parent_id": self.parent_id,
+                    **self.attributes
+                }
+            })
+        return False
+
+
+def span(name: str, **attributes):
+    """
+    Create a span for a stage.
+
+    Returns a no-op context manager when tracing is disabled. Inside the
+    ``with`` block, ``as`` binds the Span (or None when disabled).
+    """
+    if not _tracer.enabled:
+        return _NOOP_SPAN
+    return Span(name, attributes)
+
+
+def traced(name: str):
+    """Decorator wrapping a sync or async function in a span."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _tracer.enabled:
+                    return await fn(*args, **kwargs)
+                with Span(name, {}):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator